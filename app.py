@@ -1,11 +1,37 @@
 import os
+import calendar
 import logging
+import signal
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from slack_sdk import WebClient
+from slack_bolt.adapter.socket_mode.internals import run_bolt_app, send_response
+from slack_sdk.socket_mode.response import SocketModeResponse
 
 import config
+import autoapprove
+import cache
 import database
+import dedup
+import export
+import home
+import identity
+import jobs
+import leader
+import metadata
+import metrics
+import migrations
+import notifications
+import purge
+import ratelimit
+import retention
+import workers
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,23 +39,130 @@ logger = logging.getLogger(__name__)
 config.validate_config()
 database.init_db()
 
+bot_client = ratelimit.ScheduledWebClient(token=config.SLACK_BOT_TOKEN, base_url=config.SLACK_API_URL)
+user_client = ratelimit.ScheduledWebClient(token=config.SLACK_USER_TOKEN, base_url=config.SLACK_API_URL)
+
+identity.bootstrap(bot_client, user_client)
+
+def use_scheduled_client(context, next):
+    context["client"] = bot_client
+    next()
+
 app = App(
     token=config.SLACK_BOT_TOKEN,
-    signing_secret=config.SLACK_SIGNING_SECRET
+    signing_secret=config.SLACK_SIGNING_SECRET,
+    token_verification_enabled=False,
+    before_authorize=use_scheduled_client
+)
+
+deliveries = dedup.DeliveryDeduplicator(
+    config.DELIVERY_DEDUP_CACHE_SIZE,
+    config.DELIVERY_DEDUP_SECONDS,
+    persist=config.DELIVERY_DEDUP_PERSIST
+)
+
+class DeduplicatingSocketModeHandler(SocketModeHandler):
+    def handle(self, client, req):
+        event_id = req.payload.get("event_id") if isinstance(req.payload, dict) else None
+        key = f"event:{event_id}" if event_id else f"envelope:{req.envelope_id}"
+        if not deliveries.claim(key, retry=req.retry_attempt is not None):
+            logger.info(f"Skipping duplicate delivery {key} (retry {req.retry_attempt})")
+            client.send_socket_mode_response(SocketModeResponse(envelope_id=req.envelope_id))
+            return
+
+        start = time.time()
+        try:
+            response = run_bolt_app(self.app, req)
+        except Exception:
+            deliveries.release(key)
+            raise
+
+        if response.status >= 500:
+            deliveries.release(key)
+        else:
+            deliveries.complete(key)
+        send_response(client, req, response, start)
+
+handler_pool = workers.WorkerPool("handlers", config.HANDLER_WORKERS, config.HANDLER_QUEUE_SIZE)
+
+REQUESTER_DIGEST_HEADING = "Updates on your deletion requests"
+AUDIT_DIGEST_HEADING = "Deletion audit log"
+
+notifier = notifications.NotificationCoalescer(bot_client, config.NOTIFY_DIGEST_SECONDS, config.NOTIFY_DIGEST_MAX_ENTRIES)
+
+listener_seconds = metrics.Histogram(
+    "slack_cleaner_listener_seconds",
+    "Time Bolt listeners take to ack and hand off work",
+    ["listener"]
 )
 
-user_client = WebClient(token=config.SLACK_USER_TOKEN)
+file_executor = ThreadPoolExecutor(max_workers=config.FILE_DELETE_CONCURRENCY, thread_name_prefix="files")
+message_executor = ThreadPoolExecutor(max_workers=config.MESSAGE_DELETE_CONCURRENCY, thread_name_prefix="deletes")
+purge_executor = ThreadPoolExecutor(max_workers=config.MESSAGE_DELETE_CONCURRENCY, thread_name_prefix="purge-deletes")
+
+PERMANENT_DELETION_ERRORS = (
+    "cant_delete_message",
+    "compliance_exports_prevent_deletion",
+    "invalid_auth",
+    "not_authed",
+    "account_inactive",
+    "token_revoked",
+    "missing_scope",
+)
 
 @app.message_shortcut("delete_my_message")
+@metrics.timed(listener_seconds)
 def handle_message_shortcut(ack, body, client, logger):
     ack()
+    handler_pool.submit("delete_my_message", process_message_shortcut, body, client, logger)
+
+in_flight_requests = set()
+in_flight_lock = threading.Lock()
+
+def claim_in_flight(key):
+    with in_flight_lock:
+        if key in in_flight_requests:
+            return False
+        in_flight_requests.add(key)
+        return True
+
+def release_in_flight(key):
+    with in_flight_lock:
+        in_flight_requests.discard(key)
+
+def with_review_lock(admin_message_ts, process, *args):
+    key = ("review", admin_message_ts)
+    if not claim_in_flight(key):
+        logger.info(f"Review already in progress for admin message {admin_message_ts}")
+        return
+
+    try:
+        process(*args)
+    finally:
+        release_in_flight(key)
+
+def notify_duplicate_request(client, user_id, existing):
+    if existing is None:
+        status = "being submitted"
+    elif existing["status"] == "pending":
+        status = "waiting for admin review"
+    else:
+        status = "being processed"
+
+    try:
+        client.chat_postMessage(
+            channel=user_id,
+            text=f"⏳ You have already requested this deletion. Your request is {status}."
+        )
+    except:
+        pass
 
+def process_message_shortcut(body, client, logger):
     user_id = body["user"]["id"]
     message = body["message"]
     channel_id = body["channel"]["id"]
     message_ts = message["ts"]
     message_user_id = message.get("user", "")
-    message_text = message.get("text", "")
 
     logger.info(f"Deletion request: user={user_id}, channel={channel_id}, msg_user={message_user_id}")
 
@@ -43,21 +176,54 @@ def handle_message_shortcut(ack, body, client, logger):
             pass
         return
 
+    key = (channel_id, message_ts, "message")
+    if not claim_in_flight(key):
+        notify_duplicate_request(client, user_id, None)
+        return
+
     try:
-        user_info = client.users_info(user=user_id)
-        requester_name = user_info["user"]["real_name"]
+        existing = database.get_open_request(channel_id, message_ts)
+        if existing:
+            notify_duplicate_request(client, user_id, existing)
+            return
 
-        try:
-            channel_info = client.conversations_info(channel=channel_id)
-            channel_name = channel_info["channel"]["name"]
-        except:
+        create_message_request(body, client, logger)
+    finally:
+        release_in_flight(key)
+
+def message_files(message):
+    files = []
+    for file in message.get("files", []):
+        if not file.get("id") or file.get("mode") == "tombstone":
+            continue
+        if file.get("user") == message.get("user"):
+            files.append((file["id"], file.get("name", "file"), "pending", None))
+        else:
+            files.append((file["id"], file.get("name", "file"), "skipped", f"Shared file owned by {file.get('user') or 'another user'}"))
+    return files
+
+def create_message_request(body, client, logger):
+    user_id = body["user"]["id"]
+    message = body["message"]
+    channel_id = body["channel"]["id"]
+    message_ts = message["ts"]
+    message_text = message.get("text", "")
+
+    try:
+        requester_name, channel_name, permalink = workers.gather(
+            lambda: metadata.get_user_name(client, user_id),
+            lambda: metadata.get_channel_name(client, channel_id),
+            lambda: client.chat_getPermalink(channel=channel_id, message_ts=message_ts)
+        )
+
+        if isinstance(requester_name, Exception):
+            raise requester_name
+
+        if isinstance(channel_name, Exception):
             channel_name = "Unknown"
 
         try:
-            message_link = client.chat_getPermalink(
-                channel=channel_id,
-                message_ts=message_ts
-            )["permalink"]
+            message_link = permalink["permalink"]
         except:
             message_link = f"Channel: {channel_id}, TS: {message_ts}"
 
@@ -152,29 +318,41 @@ def handle_message_shortcut(ack, body, client, logger):
             text=f"Deletion request from {requester_name}"
         )
 
-        client.reactions_add(
-            channel=config.ADMIN_REVIEW_CHANNEL,
-            name="white_check_mark",
-            timestamp=admin_message["ts"]
-        )
+        for result in workers.gather(
+            lambda: client.reactions_add(
+                channel=config.ADMIN_REVIEW_CHANNEL,
+                name="white_check_mark",
+                timestamp=admin_message["ts"]
+            ),
+            lambda: client.reactions_add(
+                channel=config.ADMIN_REVIEW_CHANNEL,
+                name="x",
+                timestamp=admin_message["ts"]
+            )
+        ):
+            if isinstance(result, Exception):
+                raise result
 
-        client.reactions_add(
-            channel=config.ADMIN_REVIEW_CHANNEL,
-            name="x",
-            timestamp=admin_message["ts"]
-        )
+        try:
+            request_id = database.create_deletion_request(
+                message_ts=message_ts,
+                channel_id=channel_id,
+                channel_name=channel_name,
+                message_author_id=user_id,
+                message_author_name=requester_name,
+                message_text=message_text,
+                requester_id=user_id,
+                requester_name=requester_name,
+                admin_message_ts=admin_message["ts"],
+                files=message_files(message)
+            )
+        except database.DuplicateRequestError:
+            client.chat_delete(channel=config.ADMIN_REVIEW_CHANNEL, ts=admin_message["ts"])
+            notify_duplicate_request(client, user_id, database.get_open_request(channel_id, message_ts))
+            return
 
-        request_id = database.create_deletion_request(
-            message_ts=message_ts,
-            channel_id=channel_id,
-            channel_name=channel_name,
-            message_author_id=user_id,
-            message_author_name=requester_name,
-            message_text=message_text,
-            requester_id=user_id,
-            requester_name=requester_name,
-            admin_message_ts=admin_message["ts"]
-        )
+        if auto_approver:
+            auto_approver.schedule(request_id, datetime.utcnow())
 
         client.chat_postMessage(
             channel=user_id,
@@ -193,310 +371,908 @@ def handle_message_shortcut(ack, body, client, logger):
         except:
             pass
 
-@app.action("approve_deletion")
-def handle_approve_deletion(ack, body, client, logger):
+@app.message_shortcut("delete_my_thread_replies")
+@metrics.timed(listener_seconds)
+def handle_thread_shortcut(ack, body, client, logger):
     ack()
+    handler_pool.submit("delete_my_thread_replies", process_thread_shortcut, body, client, logger)
+
+def iter_thread_replies(client, channel_id, thread_ts):
+    cursor = None
+    while True:
+        response = client.conversations_replies(channel=channel_id, ts=thread_ts, cursor=cursor, limit=200)
+        for reply in response["messages"]:
+            if reply["ts"] != thread_ts:
+                yield reply
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return
 
-    admin_id = body["user"]["id"]
-    admin_name = body["user"]["name"]
+def process_thread_shortcut(body, client, logger):
+    user_id = body["user"]["id"]
+    message = body["message"]
+    channel_id = body["channel"]["id"]
+    thread_ts = message.get("thread_ts", message["ts"])
 
-    if not config.is_admin(admin_id):
-        try:
-            client.chat_postMessage(
-                channel=admin_id,
-                text="❌ You are not authorized to approve deletion requests."
-            )
-        except:
-            pass
+    logger.info(f"Thread deletion request: user={user_id}, channel={channel_id}, thread={thread_ts}")
+
+    key = (channel_id, thread_ts, "thread_replies", user_id)
+    if not claim_in_flight(key):
+        notify_duplicate_request(client, user_id, None)
         return
 
     try:
-        admin_message_ts = body["message"]["ts"]
-
-        request = database.get_deletion_request_by_admin_message(admin_message_ts)
-
-        if not request:
-            raise ValueError("Deletion request not found in database")
-
-        value_parts = body["actions"][0]["value"].split("|")
-        channel_id = value_parts[0]
-        message_ts = value_parts[1]
-        requester_id = value_parts[2]
-
-        try:
-            deletion_result = user_client.chat_delete(
-                channel=channel_id,
-                ts=message_ts
-            )
+        existing = database.get_open_request(channel_id, thread_ts, "thread_replies", user_id)
+        if existing:
+            notify_duplicate_request(client, user_id, existing)
+            return
 
-            if not deletion_result.get("ok"):
-                raise Exception(f"Deletion failed: {deletion_result.get('error', 'Unknown error')}")
+        create_thread_request(body, client, logger)
+    finally:
+        release_in_flight(key)
 
-            database.update_deletion_request(
-                request_id=request["id"],
-                status="approved",
-                admin_id=admin_id,
-                admin_name=admin_name
-            )
+def create_thread_request(body, client, logger):
+    user_id = body["user"]["id"]
+    message = body["message"]
+    channel_id = body["channel"]["id"]
+    thread_ts = message.get("thread_ts", message["ts"])
 
-            updated_blocks = body["message"]["blocks"][:-1]
-            updated_blocks.append({
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"✅ *Approved by <@{admin_id}> at <!date^{int(body['actions'][0]['action_ts'])}^{{date_short_pretty}} {{time}}|{body['actions'][0]['action_ts']}>*"
-                    }
-                ]
-            })
+    try:
+        replies = []
+        for reply in iter_thread_replies(client, channel_id, thread_ts):
+            if reply.get("user") == user_id:
+                replies.append(reply)
 
-            client.chat_update(
-                channel=body["channel"]["id"],
-                ts=admin_message_ts,
-                blocks=updated_blocks,
-                text=f"Deletion request approved by {admin_name}"
-            )
+        already_requested = database.get_open_message_timestamps(channel_id, [reply["ts"] for reply in replies])
+        replies = [reply for reply in replies if reply["ts"] not in already_requested][:config.BATCH_MAX_MESSAGES]
 
+        if not replies:
             client.chat_postMessage(
-                channel=requester_id,
-                text=f"✅ Your message deletion request has been approved by <@{admin_id}> and the message has been deleted."
+                channel=user_id,
+                text="❌ You have no replies in that thread that are not already awaiting deletion."
             )
+            return
 
-            if config.AUDIT_LOG_CHANNEL:
-                client.chat_postMessage(
-                    channel=config.AUDIT_LOG_CHANNEL,
-                    text=f"🗑️ Message deleted by <@{admin_id}>\n• Author: <@{request['message_author_id']}>\n• Channel: <#{channel_id}>\n• Timestamp: {message_ts}"
-                )
+        requester_name, channel_name, permalink = workers.gather(
+            lambda: metadata.get_user_name(client, user_id),
+            lambda: metadata.get_channel_name(client, channel_id),
+            lambda: client.chat_getPermalink(channel=channel_id, message_ts=thread_ts)
+        )
 
-            logger.info(f"Deletion approved: ID={request['id']}, Admin={admin_id}")
+        if isinstance(requester_name, Exception):
+            raise requester_name
 
-        except Exception as e:
-            error_str = str(e)
-            if "message_not_found" in error_str:
-                error_msg = "The message may have already been deleted."
-            elif "channel_not_found" in error_str or "not_in_channel" in error_str:
-                error_msg = "⚠️ Bot must be invited to the channel to delete messages. Please invite the bot to the channel and try again."
-            else:
-                error_msg = f"Error: {error_str}"
+        if isinstance(channel_name, Exception):
+            channel_name = "Unknown"
 
-            database.update_deletion_request(
-                request_id=request["id"],
-                status="error",
-                admin_id=admin_id,
-                admin_name=admin_name,
-                notes=error_msg
-            )
+        try:
+            message_link = permalink["permalink"]
+        except:
+            message_link = f"Channel: {channel_id}, TS: {thread_ts}"
+
+        previews = []
+        for reply in replies[:5]:
+            text = reply.get("text", "")
+            if text:
+                previews.append(f"> {text[:100]}{'...' if len(text) > 100 else ''}")
+            elif reply.get("files"):
+                previews.append(f"> 📎 {len(reply['files'])} file(s)")
+            else:
+                previews.append("> _[No text content]_")
+        if len(replies) > 5:
+            previews.append(f"_...and {len(replies) - 5} more_")
 
-            updated_blocks = body["message"]["blocks"][:-1]
-            updated_blocks.append({
+        blocks = [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": "New Deletion Request"
+                }
+            },
+            {
+                "type": "section",
+                "fields": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Requester:*\n<@{user_id}>"
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Channel:*\n<#{channel_id}>"
+                    }
+                ]
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*{len(replies)} thread replies:*\n" + "\n".join(previews)
+                }
+            },
+            {
                 "type": "context",
                 "elements": [
                     {
                         "type": "mrkdwn",
-                        "text": f"❌ *Error by <@{admin_id}>:* {error_msg}"
+                        "text": f"<{message_link}|View thread>"
                     }
                 ]
-            })
+            },
+            {
+                "type": "divider"
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "React with ✅ to approve or ❌ to deny"
+                }
+            }
+        ]
 
-            client.chat_update(
-                channel=body["channel"]["id"],
-                ts=admin_message_ts,
-                blocks=updated_blocks,
-                text=f"Deletion failed: {error_msg}"
+        admin_message = client.chat_postMessage(
+            channel=config.ADMIN_REVIEW_CHANNEL,
+            blocks=blocks,
+            text=f"Deletion request for {len(replies)} messages from {requester_name}"
+        )
+
+        for result in workers.gather(
+            lambda: client.reactions_add(
+                channel=config.ADMIN_REVIEW_CHANNEL,
+                name="white_check_mark",
+                timestamp=admin_message["ts"]
+            ),
+            lambda: client.reactions_add(
+                channel=config.ADMIN_REVIEW_CHANNEL,
+                name="x",
+                timestamp=admin_message["ts"]
             )
+        ):
+            if isinstance(result, Exception):
+                raise result
 
-            client.chat_postMessage(
-                channel=requester_id,
-                text=f"❌ Your deletion request could not be completed.\n\nReason: {error_msg}\n\nIf the bot needs to be invited to the channel, please ask an admin to invite it: `/invite @{client.auth_test()['user']}`"
+        try:
+            request_id = database.create_batch_deletion_request(
+                thread_ts=thread_ts,
+                channel_id=channel_id,
+                channel_name=channel_name,
+                message_author_id=user_id,
+                message_author_name=requester_name,
+                messages=[(reply["ts"], reply.get("text", "")) for reply in replies],
+                requester_id=user_id,
+                requester_name=requester_name,
+                admin_message_ts=admin_message["ts"],
+                files={reply["ts"]: message_files(reply) for reply in replies if reply.get("files")}
             )
+        except database.DuplicateRequestError:
+            client.chat_delete(channel=config.ADMIN_REVIEW_CHANNEL, ts=admin_message["ts"])
+            notify_duplicate_request(client, user_id, database.get_open_request(channel_id, thread_ts, "thread_replies", user_id))
             return
 
+        if auto_approver:
+            auto_approver.schedule(request_id, datetime.utcnow())
+
+        client.chat_postMessage(
+            channel=user_id,
+            text=f"✅ Your request to delete {len(replies)} of your replies in a thread in <#{channel_id}> has been submitted to the admins for review."
+        )
+
+        logger.info(f"Thread deletion request created: ID={request_id}, User={user_id}, Channel={channel_id}, Messages={len(replies)}")
+
     except Exception as e:
-        logger.error(f"Error approving deletion: {e}")
+        logger.error(f"Error handling thread deletion request: {e}")
         try:
             client.chat_postMessage(
-                channel=admin_id,
-                text=f"❌ Error approving deletion: {str(e)}"
+                channel=user_id,
+                text=f"❌ Error submitting deletion request: {str(e)}"
             )
         except:
             pass
 
-@app.action("deny_deletion")
-def handle_deny_deletion(ack, body, client, logger):
-    ack()
+def delete_message(channel_id, message_ts, source):
+    try:
+        deletion_result = user_client.chat_delete(
+            channel=channel_id,
+            ts=message_ts
+        )
 
-    admin_id = body["user"]["id"]
-    admin_name = body["user"]["name"]
+        if not deletion_result.get("ok"):
+            raise Exception(f"Deletion failed: {deletion_result.get('error', 'Unknown error')}")
+    except Exception as e:
+        error_str = str(e)
+        if "message_not_found" in error_str:
+            logger.info(f"Message already deleted: Channel={channel_id}, TS={message_ts}")
+        elif "channel_not_found" in error_str or "not_in_channel" in error_str:
+            if source == "action":
+                raise jobs.PermanentJobError("⚠️ Bot must be invited to the channel to delete messages. Please invite the bot to the channel and try again.")
+            raise jobs.PermanentJobError("⚠️ Admin user must be a member of the channel to delete messages. Please join the channel and try again.")
+        elif any(code in error_str for code in PERMANENT_DELETION_ERRORS):
+            raise jobs.PermanentJobError(f"Error: {error_str}")
+        else:
+            raise
 
-    if not config.is_admin(admin_id):
-        try:
-            client.chat_postMessage(
-                channel=admin_id,
-                text="❌ You are not authorized to deny deletion requests."
-            )
-        except:
-            pass
-        return
+def delete_messages_with_files(messages, file_request_ids, source, executor=message_executor):
+    file_deletions = start_file_deletions(file_request_ids)
+    try:
+        results = workers.gather(*[
+            (lambda message=message: delete_message(message["channel_id"], message["message_ts"], source))
+            for message in messages
+        ], executor=executor)
+    finally:
+        file_error = finish_file_deletions(file_deletions)
+    return results, file_error
+
+def delete_pending_children(pending, file_request_ids, source, admin_id, admin_name, executor=message_executor):
+    results, file_error = delete_messages_with_files(pending, file_request_ids, source, executor)
+
+    updates = []
+    retry_error = None
+    for child, result in zip(pending, results):
+        if result is None:
+            updates.append((child["id"], "approved", None))
+        elif isinstance(result, jobs.PermanentJobError):
+            updates.append((child["id"], "error", str(result)))
+        else:
+            retry_error = result
+
+    database.update_deletion_requests(updates, admin_id=admin_id, admin_name=admin_name)
+    return retry_error or file_error
+
+def delete_child_messages(job, children):
+    pending = [child for child in children if child["status"] == "pending"]
+    retry_error = delete_pending_children(
+        pending,
+        [child["id"] for child in children],
+        job["payload"].get("source"),
+        job["admin_id"],
+        job["admin_name"]
+    )
+
+    if retry_error:
+        raise retry_error
+
+    children = database.get_child_requests(job["request_id"])
+    deleted = sum(1 for child in children if child["status"] == "approved")
+    if not deleted:
+        raise jobs.PermanentJobError(children[0]["notes"] if children else "No messages to delete")
+    return deleted, len(children)
 
+def delete_request_message(job, request):
+    messages = [] if job["message_deleted"] else [request]
+    results, file_error = delete_messages_with_files(messages, [request["id"]], job["payload"].get("source"))
+
+    if messages:
+        if results[0] is not None:
+            raise results[0]
+        database.mark_deletion_job_message_deleted(job["id"])
+    if file_error:
+        raise file_error
+
+def delete_file(file_id):
     try:
-        admin_message_ts = body["message"]["ts"]
+        deletion_result = user_client.files_delete(file=file_id)
 
-        request = database.get_deletion_request_by_admin_message(admin_message_ts)
+        if not deletion_result.get("ok"):
+            raise Exception(f"File deletion failed: {deletion_result.get('error', 'Unknown error')}")
+    except Exception as e:
+        error_str = str(e)
+        if "file_not_found" in error_str or "file_deleted" in error_str:
+            logger.info(f"File already deleted: {file_id}")
+        elif "cant_delete_file" in error_str or any(code in error_str for code in PERMANENT_DELETION_ERRORS):
+            raise jobs.PermanentJobError(f"Error: {error_str}")
+        else:
+            raise
 
-        if not request:
-            raise ValueError("Deletion request not found in database")
+def start_file_deletions(request_ids):
+    files = [file for file in database.get_request_files(request_ids) if file["status"] == "pending"]
+    return [(file, file_executor.submit(delete_file, file["file_id"])) for file in files]
 
-        value_parts = body["actions"][0]["value"].split("|")
-        requester_id = value_parts[2]
+def finish_file_deletions(deletions):
+    updates = []
+    retry_error = None
+    for file, future in deletions:
+        try:
+            future.result()
+            updates.append((file["request_id"], file["file_id"], "deleted", None))
+        except jobs.PermanentJobError as e:
+            updates.append((file["request_id"], file["file_id"], "error", str(e)))
+        except Exception as e:
+            updates.append((file["request_id"], file["file_id"], "pending", str(e)))
+            retry_error = e
+
+    database.update_request_files(updates)
+    return retry_error
+
+def run_deletion_job(job):
+    request = database.get_deletion_request(job["request_id"])
+    payload = job["payload"]
+
+    outcome = "the message has been deleted"
+    audit_subject = "Message"
+    issues = []
+
+    if request["request_type"] == "thread_replies":
+        children = database.get_child_requests(request["id"])
+        request_ids = [child["id"] for child in children]
+        deleted, total = delete_child_messages(job, children)
+        outcome = f"{deleted} of {total} messages have been deleted"
+        audit_subject = f"{deleted} messages"
+        if deleted < total:
+            issues.append(f"{total - deleted} of {total} messages could not be deleted")
+    else:
+        request_ids = [request["id"]]
+        delete_request_message(job, request)
+
+    files = database.get_request_files(request_ids)
+    skipped_files = sum(1 for file in files if file["status"] == "skipped")
+    files = [file for file in files if file["status"] != "skipped"]
+    if skipped_files:
+        issues.append(f"{skipped_files} shared file(s) owned by other users were kept")
+    if files:
+        deleted_files = sum(1 for file in files if file["status"] == "deleted")
+        if deleted_files < len(files):
+            outcome += f" along with {deleted_files} of {len(files)} attached files"
+            issues.append(f"{len(files) - deleted_files} of {len(files)} attached files could not be deleted")
+        else:
+            outcome += f" along with {len(files)} attached file(s)"
+        if deleted_files:
+            audit_subject += f" and {deleted_files} file(s)"
 
-        database.update_deletion_request(
-            request_id=request["id"],
-            status="denied",
-            admin_id=admin_id,
-            admin_name=admin_name
+    notes = "; ".join(issues) or None
+
+    admin_id = job["admin_id"]
+    admin_name = job["admin_name"]
+
+    client = bot_client
+
+    if payload.get("source") == "auto":
+        client.chat_update(
+            channel=config.ADMIN_REVIEW_CHANNEL,
+            ts=request["admin_message_ts"],
+            text="✅ Deletion auto-approved",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"✅ *Auto-approved after {config.AUTO_APPROVE_MINUTES} minutes*\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
+                    }
+                }
+            ]
         )
 
-        updated_blocks = body["message"]["blocks"][:-1]
+        notifier.post(
+            channel=request["requester_id"],
+            text=f"✅ Your message deletion request has been automatically approved and {outcome}.",
+            heading=REQUESTER_DIGEST_HEADING
+        )
+
+        if config.AUDIT_LOG_CHANNEL:
+            notifier.post(
+                channel=config.AUDIT_LOG_CHANNEL,
+                text=f"🗑️ {audit_subject} deleted by auto-approval\n• Author: <@{request['message_author_id']}>\n• Channel: <#{request['channel_id']}>\n• Timestamp: {request['message_ts']}",
+                heading=AUDIT_DIGEST_HEADING
+            )
+
+        database.complete_deletion_job(job["id"], request["id"], "approved", notes=notes)
+        logger.info(f"Deletion auto-approved: ID={request['id']}, Job={job['id']}")
+        return
+
+    if payload.get("source") == "action":
+        updated_blocks = payload["blocks"]
         updated_blocks.append({
             "type": "context",
             "elements": [
                 {
                     "type": "mrkdwn",
-                    "text": f"❌ *Denied by <@{admin_id}> at <!date^{int(body['actions'][0]['action_ts'])}^{{date_short_pretty}} {{time}}|{body['actions'][0]['action_ts']}>*"
+                    "text": f"✅ *Approved by <@{admin_id}> at <!date^{int(float(payload['action_ts']))}^{{date_short_pretty}} {{time}}|{payload['action_ts']}>*"
                 }
             ]
         })
 
         client.chat_update(
-            channel=body["channel"]["id"],
-            ts=admin_message_ts,
+            channel=payload["admin_channel"],
+            ts=payload["admin_message_ts"],
             blocks=updated_blocks,
-            text=f"Deletion request denied by {admin_name}"
+            text=f"Deletion request approved by {admin_name}"
+        )
+    else:
+        client.chat_update(
+            channel=payload["admin_channel"],
+            ts=payload["admin_message_ts"],
+            text=f"✅ Deletion approved by {admin_name}",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"✅ *Approved by <@{admin_id}>*\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
+                    }
+                }
+            ]
         )
 
-        client.chat_postMessage(
-            channel=requester_id,
-            text=f"❌ Your message deletion request has been denied by <@{admin_id}>."
+    notifier.post(
+        channel=request["requester_id"],
+        text=f"✅ Your message deletion request has been approved by <@{admin_id}> and {outcome}.",
+        heading=REQUESTER_DIGEST_HEADING
+    )
+
+    if config.AUDIT_LOG_CHANNEL:
+        notifier.post(
+            channel=config.AUDIT_LOG_CHANNEL,
+            text=f"🗑️ {audit_subject} deleted by <@{admin_id}>\n• Author: <@{request['message_author_id']}>\n• Channel: <#{request['channel_id']}>\n• Timestamp: {request['message_ts']}",
+            heading=AUDIT_DIGEST_HEADING
         )
 
-        logger.info(f"Deletion denied: ID={request['id']}, Admin={admin_id}")
+    database.complete_deletion_job(job["id"], request["id"], "approved", notes=notes)
 
+    logger.info(f"Deletion approved: ID={request['id']}, Job={job['id']}, Admin={admin_id}")
+
+def report_failed_deletion_job(job, error_msg):
+    request = database.get_deletion_request(job["request_id"])
+    payload = job["payload"]
+    admin_id = job["admin_id"]
+
+    client = bot_client
+
+    if payload.get("source") == "auto":
+        client.chat_update(
+            channel=config.ADMIN_REVIEW_CHANNEL,
+            ts=request["admin_message_ts"],
+            text=f"Error: {error_msg}",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"❌ *Auto-approval failed*\n\n{error_msg}\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
+                    }
+                }
+            ]
+        )
+
+        notifier.post(
+            channel=request["requester_id"],
+            text=f"❌ Deletion failed.\n\nReason: {error_msg}",
+            heading=REQUESTER_DIGEST_HEADING
+        )
+        return
+
+    if payload.get("source") == "action":
+        updated_blocks = payload["blocks"]
+        updated_blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"❌ *Error by <@{admin_id}>:* {error_msg}"
+                }
+            ]
+        })
+
+        client.chat_update(
+            channel=payload["admin_channel"],
+            ts=payload["admin_message_ts"],
+            blocks=updated_blocks,
+            text=f"Deletion failed: {error_msg}"
+        )
+
+        notifier.post(
+            channel=request["requester_id"],
+            text=f"❌ Your deletion request could not be completed.\n\nReason: {error_msg}\n\nIf the bot needs to be invited to the channel, please ask an admin to invite it: `/invite @{identity.bot['user']}`",
+            heading=REQUESTER_DIGEST_HEADING
+        )
+    else:
+        client.chat_update(
+            channel=payload["admin_channel"],
+            ts=payload["admin_message_ts"],
+            text=f"Error: {error_msg}",
+            blocks=[
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"❌ *Error by <@{admin_id}>*\n\n{error_msg}\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
+                    }
+                }
+            ]
+        )
+
+        notifier.post(
+            channel=request["requester_id"],
+            text=f"❌ Deletion failed.\n\nReason: {error_msg}",
+            heading=REQUESTER_DIGEST_HEADING
+        )
+
+deletion_worker = jobs.DeletionWorker(run_deletion_job, report_failed_deletion_job)
+
+def iter_channel_history(client, channel_id, oldest=None, latest=None, cursor=None):
+    while True:
+        response = client.conversations_history(channel=channel_id, oldest=oldest, latest=latest, cursor=cursor, limit=200)
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        yield response["messages"], cursor
+        if not cursor:
+            return
+
+def in_purge_range(job, ts):
+    if job["oldest"] and float(ts) <= float(job["oldest"]):
+        return False
+    return not job["latest"] or float(ts) < float(job["latest"])
+
+def purge_candidates(client, job, messages):
+    candidates = {}
+    for message in messages:
+        if message.get("user") == job["message_author_id"]:
+            candidates[message["ts"]] = message
+        if message.get("reply_count"):
+            for reply in iter_thread_replies(client, job["channel_id"], message["ts"]):
+                if reply.get("user") == job["message_author_id"] and in_purge_range(job, reply["ts"]):
+                    candidates[reply["ts"]] = reply
+    return list(candidates.values())
+
+def record_purge_candidates(job, candidates):
+    timestamps = [message["ts"] for message in candidates]
+    already_requested = database.get_open_message_timestamps(job["channel_id"], timestamps)
+    new = [message for message in candidates if message["ts"] not in already_requested]
+
+    database.add_purge_candidates(
+        job["request_id"],
+        [(message["ts"], message.get("text", "")) for message in new],
+        {message["ts"]: message_files(message) for message in new if message_files(message)}
+    )
+    return database.get_pending_child_requests(job["request_id"], timestamps)
+
+def purge_range(job):
+    def day(ts):
+        return datetime.utcfromtimestamp(float(ts)).date().isoformat()
+
+    if job["oldest"] and job["latest"]:
+        return f"{day(job['oldest'])} to {day(job['latest'])} (UTC, end exclusive)"
+    if job["oldest"]:
+        return f"since {day(job['oldest'])} (UTC)"
+    if job["latest"]:
+        return f"before {day(job['latest'])} (UTC)"
+    return "all history"
+
+def purge_blocks(job, headline, counts):
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": (
+                    f"{headline}\n\n"
+                    f"• Author: <@{job['message_author_id']}>\n"
+                    f"• Channel: <#{job['channel_id']}>\n"
+                    f"• Range: {purge_range(job)}\n"
+                    f"• Requested by: <@{job['admin_id']}>\n"
+                    f"• Scanned: {job['scanned']} • Deleted: {counts.get('approved', 0)} • Failed: {counts.get('error', 0)}"
+                )
+            }
+        }
+    ]
+
+def report_purge_progress(job, headline):
+    try:
+        counts = database.count_child_requests(job["request_id"])
+        bot_client.chat_update(
+            channel=config.ADMIN_REVIEW_CHANNEL,
+            ts=job["admin_message_ts"],
+            text=headline.replace("*", ""),
+            blocks=purge_blocks(job, headline, counts)
+        )
+        return counts
     except Exception as e:
-        logger.error(f"Error denying deletion: {e}")
+        logger.error(f"Error reporting progress of purge job {job['id']}: {e}")
+        return None
+
+def run_purge_job(job, stopping):
+    last_report = time.monotonic()
+    pages = iter_channel_history(bot_client, job["channel_id"], job["oldest"], job["latest"], job["cursor"])
+    unfinished_files = database.get_child_ids_with_pending_files(job["request_id"])
+
+    try:
+        for messages, cursor in pages:
+            pending = record_purge_candidates(job, purge_candidates(bot_client, job, messages))
+
+            retry_error = delete_pending_children(
+                pending,
+                [child["id"] for child in pending] + unfinished_files,
+                "purge",
+                job["admin_id"],
+                job["admin_name"],
+                executor=purge_executor
+            )
+            if retry_error:
+                raise retry_error
+            unfinished_files = []
+
+            database.advance_purge_job(job["id"], cursor, len(messages))
+            job.update(cursor=cursor, scanned=job["scanned"] + len(messages), attempts=0)
+
+            if cursor and stopping():
+                logger.info(f"Purge job {job['id']} paused at cursor {cursor}")
+                return
+
+            if time.monotonic() - last_report >= config.PURGE_PROGRESS_SECONDS:
+                report_purge_progress(job, "⏳ *Purge in progress*")
+                last_report = time.monotonic()
+    except jobs.PermanentJobError:
+        raise
+    except Exception as e:
+        error_str = str(e)
+        if "channel_not_found" in error_str or "not_in_channel" in error_str:
+            raise jobs.PermanentJobError("⚠️ Bot must be invited to the channel to read its history. Please invite the bot to the channel and try again.") from e
+        if any(code in error_str for code in PERMANENT_DELETION_ERRORS):
+            raise jobs.PermanentJobError(f"Error: {error_str}") from e
+        raise
+
+    counts = database.count_child_requests(job["request_id"])
+    deleted = counts.get("approved", 0)
+    failed = counts.get("error", 0)
+    notes = f"{failed} of {deleted + failed} messages could not be deleted" if failed else None
+    database.complete_purge_job(job["id"], job["request_id"], "approved", notes=notes)
+    report_purge_progress(job, "✅ *Purge complete*")
+
+    if config.AUDIT_LOG_CHANNEL and deleted:
+        notifier.post(
+            channel=config.AUDIT_LOG_CHANNEL,
+            text=f"🗑️ {deleted} messages purged by <@{job['admin_id']}>\n• Author: <@{job['message_author_id']}>\n• Channel: <#{job['channel_id']}>\n• Range: {purge_range(job)}",
+            heading=AUDIT_DIGEST_HEADING
+        )
+
+    logger.info(f"Purge complete: ID={job['request_id']}, Job={job['id']}, Scanned={job['scanned']}, Deleted={deleted}, Failed={failed}")
+
+def report_failed_purge_job(job, error_msg):
+    report_purge_progress(job, f"❌ *Purge failed*\n\n{error_msg}")
+
+purge_worker = purge.PurgeWorker(run_purge_job, report_failed_purge_job)
+
+def auto_approve_request(request_id):
+    job_id = database.enqueue_deletion_job(
+        request_id=request_id,
+        admin_id="auto_approve",
+        admin_name="Auto-approve",
+        payload={"source": "auto"}
+    )
+
+    if job_id is not None:
+        deletion_worker.notify()
+        logger.info(f"Auto-approval queued: ID={request_id}, Job={job_id}")
+
+auto_approver = autoapprove.AutoApproveScheduler(
+    auto_approve_request,
+    config.AUTO_APPROVE_MINUTES,
+    refresh_seconds=config.DELETION_JOB_POLL_SECONDS if config.MULTI_WORKER else None
+) if config.AUTO_APPROVE_MINUTES > 0 else None
+
+retention_worker = retention.RetentionWorker(config.RETENTION_DAYS, config.RETENTION_MODE) if config.RETENTION_DAYS > 0 else None
+
+migration_worker = migrations.MigrationWorker()
+
+leader_elector = leader.LeaderElector("singletons", [migration_worker, auto_approver, retention_worker, purge_worker], maintenance=database.prune_deliveries)
+
+queue_depths = cache.TTLCache(1, config.METRICS_QUEUE_DEPTH_SECONDS)
+
+def collect_app_metrics():
+    stats = handler_pool.stats()
+    yield "slack_cleaner_handler_queue_depth", "gauge", "Handler tasks waiting for a worker", [({}, stats["queued"])]
+    yield "slack_cleaner_handler_active", "gauge", "Handler tasks currently running", [({}, stats["active"])]
+    yield "slack_cleaner_handler_rejected_total", "counter", "Handler tasks rejected because the queue was full", [({}, stats["rejected"])]
+
+    depths = queue_depths.get("depths")
+    if depths is None:
+        depths = database.get_queue_depths()
+        queue_depths.set("depths", depths)
+    yield "slack_cleaner_deletion_jobs", "gauge", "Deletion jobs by state", [
+        ({"state": state}, count) for state, count in depths["jobs"].items()
+    ]
+    yield "slack_cleaner_deletion_requests", "gauge", "Deletion requests by status", [
+        ({"status": status}, count) for status, count in depths["requests"].items()
+    ]
+
+    delivery_stats = deliveries.stats()
+    yield "slack_cleaner_duplicate_deliveries_total", "counter", "Slack deliveries skipped as duplicates", [({}, delivery_stats["hits"])]
+    yield "slack_cleaner_new_deliveries_total", "counter", "Slack deliveries claimed for processing", [({}, delivery_stats["misses"])]
+    yield "slack_cleaner_delivery_retries_total", "counter", "Slack deliveries marked as retries", [({}, delivery_stats["retries"])]
+
+    yield "slack_cleaner_leader", "gauge", "Whether this instance runs the singleton services", [({}, int(leader_elector.is_leader))]
+
+metrics.register_collector(collect_app_metrics)
+
+@app.action("approve_deletion")
+@metrics.timed(listener_seconds)
+def handle_approve_deletion(ack, body, client, logger):
+    ack()
+    handler_pool.submit("approve_deletion", with_review_lock, body["message"]["ts"], process_approve_deletion, body, client, logger)
+
+def process_approve_deletion(body, client, logger):
+    admin_id = body["user"]["id"]
+    admin_name = body["user"]["name"]
+
+    if not config.is_admin(admin_id):
         try:
             client.chat_postMessage(
                 channel=admin_id,
-                text=f"❌ Error denying deletion: {str(e)}"
+                text="❌ You are not authorized to approve deletion requests."
             )
         except:
             pass
-
-@app.event("reaction_added")
-def handle_reaction_added(event, client, logger):
-    if event["reaction"] not in ["white_check_mark", "x"]:
         return
 
-    if event["item"]["channel"] != config.ADMIN_REVIEW_CHANNEL:
-        return
+    try:
+        admin_message_ts = body["message"]["ts"]
 
-    user_id = event["user"]
-    if not config.is_admin(user_id):
-        return
+        request = database.get_deletion_request_by_admin_message(admin_message_ts)
 
-    message_ts = event["item"]["ts"]
+        if not request:
+            raise ValueError("Deletion request not found in database")
 
-    request = database.get_deletion_request_by_admin_message(message_ts)
-    if not request or request["status"] != "pending":
-        return
+        job_id = database.enqueue_deletion_job(
+            request_id=request["id"],
+            admin_id=admin_id,
+            admin_name=admin_name,
+            payload={
+                "source": "action",
+                "admin_channel": body["channel"]["id"],
+                "admin_message_ts": admin_message_ts,
+                "blocks": body["message"]["blocks"][:-1],
+                "action_ts": body["actions"][0]["action_ts"]
+            }
+        )
 
-    admin_info = client.users_info(user=user_id)
-    admin_name = admin_info["user"]["real_name"]
+        if job_id is None:
+            logger.info(f"Deletion request already handled: ID={request['id']}, Status={request['status']}")
+            return
 
-    if event["reaction"] == "white_check_mark":
+        deletion_worker.notify()
+        logger.info(f"Deletion queued: ID={request['id']}, Job={job_id}, Admin={admin_id}")
+
+    except Exception as e:
+        logger.error(f"Error approving deletion: {e}")
         try:
-            deletion_result = user_client.chat_delete(
-                channel=request["channel_id"],
-                ts=request["message_ts"]
+            client.chat_postMessage(
+                channel=admin_id,
+                text=f"❌ Error approving deletion: {str(e)}"
             )
+        except:
+            pass
 
-            if not deletion_result.get("ok"):
-                raise Exception(f"Deletion failed: {deletion_result.get('error', 'Unknown error')}")
+@app.action("deny_deletion")
+@metrics.timed(listener_seconds)
+def handle_deny_deletion(ack, body, client, logger):
+    ack()
+    handler_pool.submit("deny_deletion", with_review_lock, body["message"]["ts"], process_deny_deletion, body, client, logger)
 
-            database.update_deletion_request(
-                request_id=request["id"],
-                status="approved",
-                admin_id=user_id,
-                admin_name=admin_name
-            )
+def process_deny_deletion(body, client, logger):
+    admin_id = body["user"]["id"]
+    admin_name = body["user"]["name"]
 
+    if not config.is_admin(admin_id):
+        try:
             client.chat_postMessage(
-                channel=request["requester_id"],
-                text=f"✅ Your message deletion request has been approved by <@{user_id}> and the message has been deleted."
+                channel=admin_id,
+                text="❌ You are not authorized to deny deletion requests."
             )
+        except:
+            pass
+        return
 
-            if config.AUDIT_LOG_CHANNEL:
-                client.chat_postMessage(
-                    channel=config.AUDIT_LOG_CHANNEL,
-                    text=f"🗑️ Message deleted by <@{user_id}>\n• Author: <@{request['message_author_id']}>\n• Channel: <#{request['channel_id']}>\n• Timestamp: {request['message_ts']}"
-                )
+    try:
+        admin_message_ts = body["message"]["ts"]
 
-            client.chat_update(
-                channel=config.ADMIN_REVIEW_CHANNEL,
-                ts=message_ts,
-                text=f"✅ Deletion approved by {admin_name}",
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"✅ *Approved by <@{user_id}>*\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
-                        }
-                    }
-                ]
-            )
+        request = database.get_deletion_request_by_admin_message(admin_message_ts)
 
-            logger.info(f"Deletion approved via reaction: ID={request['id']}, Admin={user_id}")
+        if not request:
+            raise ValueError("Deletion request not found in database")
 
-        except Exception as e:
-            logger.error(f"Error approving deletion via reaction: {e}")
+        value_parts = body["actions"][0]["value"].split("|")
+        requester_id = value_parts[2]
 
-            error_str = str(e)
-            if "channel_not_found" in error_str:
-                error_msg = "⚠️ Admin user must be a member of the channel to delete messages. Please join the channel and try again."
-            else:
-                error_msg = f"Error: {error_str}"
+        if not database.update_deletion_request(
+            request_id=request["id"],
+            status="denied",
+            admin_id=admin_id,
+            admin_name=admin_name,
+            expected_status="pending"
+        ):
+            logger.info(f"Deletion request already handled: ID={request['id']}")
+            return
 
-            client.chat_update(
-                channel=config.ADMIN_REVIEW_CHANNEL,
-                ts=message_ts,
-                text=f"Error: {error_msg}",
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"❌ *Error by <@{user_id}>*\n\n{error_msg}\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
-                        }
-                    }
-                ]
-            )
+        updated_blocks = body["message"]["blocks"][:-1]
+        updated_blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"❌ *Denied by <@{admin_id}> at <!date^{int(body['actions'][0]['action_ts'])}^{{date_short_pretty}} {{time}}|{body['actions'][0]['action_ts']}>*"
+                }
+            ]
+        })
+
+        client.chat_update(
+            channel=body["channel"]["id"],
+            ts=admin_message_ts,
+            blocks=updated_blocks,
+            text=f"Deletion request denied by {admin_name}"
+        )
 
+        notifier.post(
+            channel=requester_id,
+            text=f"❌ Your message deletion request has been denied by <@{admin_id}>.",
+            heading=REQUESTER_DIGEST_HEADING
+        )
+
+        logger.info(f"Deletion denied: ID={request['id']}, Admin={admin_id}")
+
+    except Exception as e:
+        logger.error(f"Error denying deletion: {e}")
+        try:
             client.chat_postMessage(
-                channel=request["requester_id"],
-                text=f"❌ Deletion failed.\n\nReason: {error_msg}"
+                channel=admin_id,
+                text=f"❌ Error denying deletion: {str(e)}"
             )
+        except:
+            pass
+
+@app.event("reaction_added")
+@metrics.timed(listener_seconds)
+def handle_reaction_added(event, client, logger):
+    if event["reaction"] not in ["white_check_mark", "x"]:
+        return
+
+    if event["item"]["channel"] != config.ADMIN_REVIEW_CHANNEL:
+        return
+
+    if not config.is_admin(event["user"]):
+        return
+
+    handler_pool.submit("reaction_added", with_review_lock, event["item"]["ts"], process_reaction_added, event, client, logger)
+
+def process_reaction_added(event, client, logger):
+    user_id = event["user"]
+    message_ts = event["item"]["ts"]
+
+    request = database.get_pending_request_by_admin_message(message_ts)
+    if not request:
+        return
+
+    admin_name = metadata.get_user_name(client, user_id)
+
+    if event["reaction"] == "white_check_mark":
+        job_id = database.enqueue_deletion_job(
+            request_id=request["id"],
+            admin_id=user_id,
+            admin_name=admin_name,
+            payload={
+                "source": "reaction",
+                "admin_channel": config.ADMIN_REVIEW_CHANNEL,
+                "admin_message_ts": message_ts
+            }
+        )
+
+        if job_id is None:
+            return
+
+        deletion_worker.notify()
+        logger.info(f"Deletion queued via reaction: ID={request['id']}, Job={job_id}, Admin={user_id}")
 
     elif event["reaction"] == "x":
-        database.update_deletion_request(
+        if not database.update_deletion_request(
             request_id=request["id"],
             status="denied",
             admin_id=user_id,
-            admin_name=admin_name
-        )
+            admin_name=admin_name,
+            expected_status="pending"
+        ):
+            return
 
-        client.chat_postMessage(
+        notifier.post(
             channel=request["requester_id"],
-            text=f"❌ Your message deletion request has been denied by <@{user_id}>."
+            text=f"❌ Your message deletion request has been denied by <@{user_id}>.",
+            heading=REQUESTER_DIGEST_HEADING
         )
 
         client.chat_update(
@@ -516,57 +1292,362 @@ def handle_reaction_added(event, client, logger):
 
         logger.info(f"Deletion denied via reaction: ID={request['id']}, Admin={user_id}")
 
+BULK_USAGE = (
+    "Usage: `/deletion-requests approve|deny [#channel] [@requester] [older:30m|2h|1d]`\n"
+    "Approves or denies every pending request matching the filters.\n\n"
+    "`/deletion-requests export [csv|jsonl] [since:YYYY-MM-DD] [until:YYYY-MM-DD] [status:approved]`\n"
+    "Uploads the matching audit trail to the admin review channel as a gzip file.\n\n"
+    "`/deletion-requests purge @user #channel [since:YYYY-MM-DD] [until:YYYY-MM-DD]`\n"
+    "Deletes every message the user posted in the channel, including thread replies, reporting progress in the admin review channel."
+)
+
+BULK_AGE_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def parse_export_command(words: list) -> Dict[str, Any]:
+    filters = {"action": "export", "format": "csv", "since": None, "until": None, "status": None}
+
+    for word in words:
+        key, _, value = word.partition(":")
+        key = key.lower()
+        try:
+            if key in export.FORMATS and not value:
+                filters["format"] = key
+            elif key in ("since", "until") and value:
+                filters[key] = export.parse_date(value)
+            elif key == "status" and value:
+                filters["status"] = value.lower()
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Unrecognised filter `{word}`.\n\n{BULK_USAGE}")
+
+    return filters
+
+def parse_purge_date(value: str) -> str:
+    return str(calendar.timegm(date.fromisoformat(value).timetuple()))
+
+def parse_purge_command(words: list) -> Dict[str, Any]:
+    filters = {"action": "purge", "author_id": None, "channel_id": None, "oldest": None, "latest": None}
+
+    for word in words:
+        key, _, value = word.partition(":")
+        key = key.lower()
+        try:
+            if word.startswith("<#") and word.endswith(">"):
+                filters["channel_id"] = word[2:-1].split("|")[0]
+            elif word.startswith("<@") and word.endswith(">"):
+                filters["author_id"] = word[2:-1].split("|")[0]
+            elif key == "since" and value:
+                filters["oldest"] = parse_purge_date(value)
+            elif key == "until" and value:
+                filters["latest"] = parse_purge_date(value)
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Unrecognised filter `{word}`.\n\n{BULK_USAGE}")
+
+    if not filters["author_id"] or not filters["channel_id"]:
+        raise ValueError(f"A purge needs both a user and a channel.\n\n{BULK_USAGE}")
+
+    return filters
+
+def parse_bulk_command(text: str) -> Dict[str, Any]:
+    words = text.split()
+    if words and words[0].lower() == "export":
+        return parse_export_command(words[1:])
+    if words and words[0].lower() == "purge":
+        return parse_purge_command(words[1:])
+    if not words or words[0].lower() not in ("approve", "deny"):
+        raise ValueError(BULK_USAGE)
+
+    filters = {"action": words[0].lower(), "channel_id": None, "requester_id": None, "older_than": None}
+
+    for word in words[1:]:
+        if word.startswith("<#") and word.endswith(">"):
+            filters["channel_id"] = word[2:-1].split("|")[0]
+        elif word.startswith("<@") and word.endswith(">"):
+            filters["requester_id"] = word[2:-1].split("|")[0]
+        elif word.lower().startswith("older:") and word[-1:].lower() in BULK_AGE_UNITS and word[6:-1].isdigit():
+            seconds = int(word[6:-1]) * BULK_AGE_UNITS[word[-1].lower()]
+            filters["older_than"] = datetime.utcnow() - timedelta(seconds=seconds)
+        else:
+            raise ValueError(f"Unrecognised filter `{word}`.\n\n{BULK_USAGE}")
+
+    return filters
+
+@app.command("/deletion-requests")
+@metrics.timed(listener_seconds)
+def handle_bulk_command(ack, command, respond, client, logger):
+    if not config.is_listed_admin(command["user_id"]):
+        ack("❌ Only users listed in ADMIN_USER_IDS can run bulk actions on deletion requests.")
+        return
+
+    try:
+        filters = parse_bulk_command(command.get("text", ""))
+    except ValueError as e:
+        ack(str(e))
+        return
+
+    if filters["action"] == "export":
+        ack("⏳ Preparing export...")
+        handler_pool.submit("export", process_export_command, command["user_id"], filters, respond, client, logger)
+        return
+
+    if filters["action"] == "purge":
+        ack("⏳ Starting purge...")
+        handler_pool.submit("purge", process_purge_command, command["user_id"], filters, respond, client, logger)
+        return
+
+    ack(f"⏳ Processing bulk {filters['action']}...")
+    handler_pool.submit("bulk_deletion", process_bulk_command, command["user_id"], filters, respond, client, logger)
+
+def process_export_command(admin_id, filters, respond, client, logger):
+    filename = f"deletion-requests-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{filters['format']}.gz"
+
+    with tempfile.TemporaryFile() as output:
+        try:
+            count = export.write_export(output, filters["format"], filters["since"], filters["until"], filters["status"])
+            output.seek(0)
+            client.files_upload_v2(
+                channel=config.ADMIN_REVIEW_CHANNEL,
+                file=output,
+                filename=filename,
+                title=filename,
+                initial_comment=f"📦 Audit export requested by <@{admin_id}>: {count} deletion request(s)"
+            )
+        except Exception as e:
+            logger.error(f"Error exporting deletion requests: {e}")
+            respond(f"❌ Export failed: {e}")
+            return
+
+    respond(f"✅ Exported {count} deletion request(s) to <#{config.ADMIN_REVIEW_CHANNEL}>.")
+    logger.info(f"Export by {admin_id}: {count} requests, filters={filters}")
+
+def process_purge_command(admin_id, filters, respond, client, logger):
+    job = {
+        "message_author_id": filters["author_id"],
+        "channel_id": filters["channel_id"],
+        "oldest": filters["oldest"],
+        "latest": filters["latest"],
+        "admin_id": admin_id,
+        "scanned": 0
+    }
+
+    admin_name, author_name, channel_name = workers.gather(
+        lambda: metadata.get_user_name(client, admin_id),
+        lambda: metadata.get_user_name(client, filters["author_id"]),
+        lambda: metadata.get_channel_name(client, filters["channel_id"])
+    )
+
+    if isinstance(author_name, Exception):
+        logger.error(f"Error looking up purge author {filters['author_id']}: {author_name}")
+        respond(f"❌ Could not start purge: <@{filters['author_id']}> could not be looked up. Check the user and try again.")
+        return
+
+    if isinstance(channel_name, Exception):
+        logger.error(f"Error looking up purge channel {filters['channel_id']}: {channel_name}")
+        respond(f"❌ Could not start purge: <#{filters['channel_id']}> could not be looked up. Make sure the bot is in the channel and try again.")
+        return
+
+    if isinstance(admin_name, Exception):
+        admin_name = "Unknown"
+
+    try:
+        headline = "⏳ *Purge queued*"
+        progress = client.chat_postMessage(
+            channel=config.ADMIN_REVIEW_CHANNEL,
+            text=headline.replace("*", ""),
+            blocks=purge_blocks(job, headline, {})
+        )
+
+        request_id = database.create_purge_request(
+            channel_id=filters["channel_id"],
+            channel_name=channel_name,
+            author_id=filters["author_id"],
+            author_name=author_name,
+            admin_id=admin_id,
+            admin_name=admin_name,
+            admin_message_ts=progress["ts"],
+            oldest=filters["oldest"],
+            latest=filters["latest"]
+        )
+    except Exception as e:
+        logger.error(f"Error starting purge: {e}")
+        respond(f"❌ Could not start purge: {e}")
+        return
+
+    purge_worker.notify()
+    respond(f"✅ Purge of <@{filters['author_id']}>'s messages in <#{filters['channel_id']}> queued. Progress is posted in <#{config.ADMIN_REVIEW_CHANNEL}>.")
+    logger.info(f"Purge queued by {admin_id}: ID={request_id}, filters={filters}")
+
+def process_bulk_command(admin_id, filters, respond, client, logger):
+    admin_name = metadata.get_user_name(client, admin_id)
+
+    requests = database.get_pending_requests(
+        channel_id=filters["channel_id"],
+        requester_id=filters["requester_id"],
+        older_than=filters["older_than"],
+        limit=config.BULK_MAX_REQUESTS
+    )
+
+    if not requests:
+        respond("No pending deletion requests match those filters.")
+        return
+
+    if filters["action"] == "approve":
+        queued = 0
+        for request in requests:
+            if database.enqueue_deletion_job(
+                request_id=request["id"],
+                admin_id=admin_id,
+                admin_name=admin_name,
+                payload={
+                    "source": "bulk",
+                    "admin_channel": config.ADMIN_REVIEW_CHANNEL,
+                    "admin_message_ts": request["admin_message_ts"]
+                }
+            ) is not None:
+                queued += 1
+        if queued:
+            deletion_worker.notify()
+
+        respond(f"Bulk approve queued {queued} deletion request(s). Each review card is updated as its deletion completes.")
+        logger.info(f"Bulk approve by {admin_id}: {queued} of {len(requests)} requests queued")
+        return
+
+    denied = database.deny_deletion_requests([request["id"] for request in requests], admin_id, admin_name)
+    requests = [request for request in requests if request["id"] in denied]
+
+    by_requester: Dict[str, list] = {}
+    for request in requests:
+        by_requester.setdefault(request["requester_id"], []).append(request)
+
+    for requester_id, items in by_requester.items():
+        try:
+            client.chat_postMessage(
+                channel=requester_id,
+                text=f"Your message deletion requests have been reviewed by <@{admin_id}>:\n\n" + "\n".join(
+                    f"❌ Deletion of your message in <#{request['channel_id']}> was denied." for request in items
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error sending bulk deletion update: {e}")
+
+    # chat.update is paced per method, so fanning these out would only tie up the shared pool
+    for request in requests:
+        try:
+            client.chat_update(
+                channel=config.ADMIN_REVIEW_CHANNEL,
+                ts=request["admin_message_ts"],
+                text=f"❌ Denied by <@{admin_id}> (bulk)",
+                blocks=[
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"❌ *Denied by <@{admin_id}>* (bulk)\n\nOriginal request from <@{request['requester_id']}> in <#{request['channel_id']}>"
+                        }
+                    }
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Error sending bulk deletion update: {e}")
+
+    respond(f"Bulk deny complete: {len(requests)} denied.")
+
+    logger.info(f"Bulk deny by {admin_id}: {len(requests)} requests")
+
+@app.event("user_change")
+@metrics.timed(listener_seconds)
+def handle_user_change(event, logger):
+    metadata.update_user(event["user"])
+
+@app.event("channel_rename")
+@app.event("group_rename")
+@metrics.timed(listener_seconds)
+def handle_channel_rename(event, logger):
+    metadata.update_channel(event["channel"])
+
+database.on_request_change(lambda: home.schedule_refresh(bot_client))
+
 @app.event("app_home_opened")
+@metrics.timed(listener_seconds)
 def handle_app_home_opened(client, event, logger):
+    if event.get("tab", "home") != "home":
+        return
+
     user_id = event["user"]
+    home.publish(client, user_id, config.is_listed_admin(user_id))
 
-    is_admin = config.is_admin(user_id)
+def handle_home_navigation(body, client, update):
+    user_id = body["user"]["id"]
+    if not config.is_listed_admin(user_id):
+        return
 
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "🗑️ Message Deletion App"
-            }
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "This app allows you to request deletion of your own messages with admin approval."
-            }
-        },
-        {
-            "type": "divider"
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "*How to use:*\n1. Right-click on any message you've posted\n2. Select 'Delete my message' from the shortcuts menu\n3. Wait for admin approval"
-            }
-        }
-    ]
+    update(user_id, body["actions"][0])
+    home.publish(client, user_id, True)
 
-    if is_admin:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*Admin Status:* ✅ You are an admin\n\nReview requests in <#{config.ADMIN_REVIEW_CHANNEL}>"
-            }
-        })
+@app.action("home_filter_status")
+@metrics.timed(listener_seconds)
+def handle_home_filter_status(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.set_filter(
+        user_id, "status", None if action["selected_option"]["value"] == "all" else action["selected_option"]["value"]
+    ))
 
-    client.views_publish(
-        user_id=user_id,
-        view={
-            "type": "home",
-            "blocks": blocks
-        }
-    )
+@app.action("home_filter_channel")
+@metrics.timed(listener_seconds)
+def handle_home_filter_channel(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.set_filter(user_id, "channel_id", action.get("selected_conversation")))
+
+@app.action("home_filter_author")
+@metrics.timed(listener_seconds)
+def handle_home_filter_author(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.set_filter(user_id, "author_id", action.get("selected_user")))
+
+@app.action("home_clear_filters")
+@metrics.timed(listener_seconds)
+def handle_home_clear_filters(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.clear_filters(user_id))
+
+@app.action("home_next_page")
+@metrics.timed(listener_seconds)
+def handle_home_next_page(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.next_page(user_id, action["value"]))
+
+@app.action("home_previous_page")
+@metrics.timed(listener_seconds)
+def handle_home_previous_page(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.previous_page(user_id))
+
+@app.action("home_first_page")
+@metrics.timed(listener_seconds)
+def handle_home_first_page(ack, body, client):
+    ack()
+    handle_home_navigation(body, client, lambda user_id, action: home.first_page(user_id))
 
 if __name__ == "__main__":
-    handler = SocketModeHandler(app, config.SLACK_APP_TOKEN)
-    logger.info(f"⚡️ Slack app is running on port {config.PORT}!")
-    handler.start()
\ No newline at end of file
+    handler = DeduplicatingSocketModeHandler(app, config.SLACK_APP_TOKEN)
+    logger.info(f"⚡️ Slack app is running on port {config.PORT} as {config.INSTANCE_ID}!")
+    if config.METRICS_ENABLED:
+        metrics.start_server(config.METRICS_HOST, config.PORT)
+    notifier.start()
+    deletion_worker.start()
+    leader_elector.start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        handler.start()
+    finally:
+        leader_elector.stop()
+        deletion_worker.stop()
+        file_executor.shutdown()
+        message_executor.shutdown()
+        purge_executor.shutdown()
+        handler_pool.shutdown()
+        notifier.stop()
+        database.close_db()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import config
+import database
+
+logger = logging.getLogger(__name__)
+
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+class AutoApproveScheduler:
+    def __init__(
+        self,
+        approve: Callable[[int], None],
+        delay_minutes: int,
+        batch_size: int = 1000,
+        refresh_seconds: Optional[float] = None
+    ):
+        self._approve = approve
+        self._delay = timedelta(minutes=delay_minutes)
+        self._batch_size = batch_size
+        self._refresh_seconds = refresh_seconds
+        self._next_refresh = 0.0
+        self._heap: List[Tuple[datetime, int]] = []
+        self._scheduled: Set[int] = set()
+        self._attempts: Dict[int, int] = {}
+        self._loaded_until: Optional[str] = None
+        self._exhausted = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            self._heap = []
+            self._scheduled = set()
+            self._attempts = {}
+            self._loaded_until = None
+            self._exhausted = False
+        self._stopping.clear()
+        self._load_next_batch()
+        self._thread = threading.Thread(target=self._loop, name="auto-approve", daemon=True)
+        self._thread.start()
+        logger.info(f"Auto-approve enabled: pending requests are approved after {self._delay}")
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def schedule(self, request_id: int, requested_at: datetime):
+        with self._lock:
+            if not self._exhausted or self._stopping.is_set() or request_id in self._scheduled:
+                return
+            self._scheduled.add(request_id)
+            heapq.heappush(self._heap, (requested_at + self._delay, request_id))
+        self._wake.set()
+
+    def _load_next_batch(self, after: Optional[str] = None):
+        rows = database.get_pending_deadlines(after=after or self._loaded_until, limit=self._batch_size)
+        with self._lock:
+            for row in rows:
+                if row["id"] in self._scheduled:
+                    continue
+                self._scheduled.add(row["id"])
+                requested_at = datetime.fromisoformat(row["request_timestamp"])
+                heapq.heappush(self._heap, (requested_at + self._delay, row["id"]))
+            if rows:
+                self._loaded_until = max(self._loaded_until or "", rows[-1]["request_timestamp"])
+            self._exhausted = len(rows) < self._batch_size
+
+    def _refresh(self):
+        after = None
+        if self._loaded_until:
+            after = (datetime.fromisoformat(self._loaded_until) - REFRESH_OVERLAP).isoformat()
+        self._load_next_batch(after)
+
+    def _pop_due(self) -> Tuple[List[int], Optional[float]]:
+        now = datetime.utcnow()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                request_id = heapq.heappop(self._heap)[1]
+                self._scheduled.discard(request_id)
+                due.append(request_id)
+            needs_refill = not self._heap and not self._exhausted
+            delay = (self._heap[0][0] - now).total_seconds() if self._heap else None
+        if needs_refill:
+            self._load_next_batch()
+            return due, 0
+
+        if self._refresh_seconds:
+            until_refresh = self._next_refresh - time.monotonic()
+            if until_refresh <= 0:
+                self._next_refresh = time.monotonic() + self._refresh_seconds
+                self._refresh()
+                return due, 0
+            delay = until_refresh if delay is None else min(delay, until_refresh)
+        return due, delay
+
+    def _retry_later(self, request_id: int) -> Tuple[int, float]:
+        with self._lock:
+            attempts = self._attempts[request_id] = self._attempts.get(request_id, 0) + 1
+            backoff = min(
+                config.DELETION_JOB_MAX_BACKOFF_SECONDS,
+                config.DELETION_JOB_BACKOFF_SECONDS * 2 ** (attempts - 1)
+            )
+            if request_id not in self._scheduled:
+                self._scheduled.add(request_id)
+                heapq.heappush(self._heap, (datetime.utcnow() + timedelta(seconds=backoff), request_id))
+        return attempts, backoff
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                due, delay = self._pop_due()
+            except Exception as e:
+                logger.error(f"Error loading auto-approve deadlines: {e}")
+                due, delay = [], config.DELETION_JOB_POLL_SECONDS
+
+            for request_id in due:
+                try:
+                    self._approve(request_id)
+                except Exception as e:
+                    attempts, backoff = self._retry_later(request_id)
+                    logger.error(f"Error auto-approving request {request_id} (attempt {attempts}), retrying in {backoff}s: {e}")
+                else:
+                    with self._lock:
+                        self._attempts.pop(request_id, None)
+
+            if not due:
+                self._wake.wait(delay)
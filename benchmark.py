@@ -0,0 +1,364 @@
+import argparse
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+from urllib.parse import parse_qs
+
+ADMIN_ID = "UADMIN"
+ADMIN_CHANNEL = "CADMIN"
+AUDIT_CHANNEL = "CAUDIT"
+CHANNELS = ["C0000001", "C0000002", "C0000003", "C0000004"]
+
+class FakeSlack:
+    def __init__(self, latency_ms: float, error_rate: float, ratelimit_rate: float, retry_after: int, seed: int):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.ratelimit_rate = ratelimit_rate
+        self.retry_after = retry_after
+        self.injecting = False
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.ratelimited: Counter = Counter()
+        self._random = random.Random(seed)
+        self._ts = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api/"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="fake-slack", daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+
+    def snapshot(self) -> Dict[str, Counter]:
+        with self._lock:
+            return {"calls": Counter(self.calls), "errors": Counter(self.errors), "ratelimited": Counter(self.ratelimited)}
+
+    def respond(self, method: str, args: Dict[str, Any]):
+        with self._lock:
+            self.calls[method] += 1
+            roll = self._random.random() if self.injecting else 1.0
+            if roll < self.ratelimit_rate:
+                self.ratelimited[method] += 1
+                return 429, {"Retry-After": str(self.retry_after)}, {"ok": False, "error": "ratelimited"}
+            if roll < self.ratelimit_rate + self.error_rate:
+                self.errors[method] += 1
+                return 200, {}, {"ok": False, "error": "internal_error"}
+            ts = next(self._ts)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        response: Dict[str, Any] = {"ok": True}
+        if method == "auth.test":
+            response.update(user="cleaner", user_id="UBOT", team_id="T0000001", bot_id="B0000001")
+        elif method == "users.info":
+            response["user"] = {"id": args.get("user"), "name": args.get("user"), "real_name": f"User {args.get('user')}"}
+        elif method == "conversations.info":
+            response["channel"] = {"id": args.get("channel"), "name": f"channel-{args.get('channel')}"}
+        elif method == "chat.getPermalink":
+            response["permalink"] = f"https://example.slack.com/archives/{args.get('channel')}/p{args.get('message_ts')}"
+        elif method == "chat.postMessage":
+            response.update(channel=args.get("channel"), ts=f"1700000000.{ts:06d}")
+        elif method == "conversations.replies":
+            response.update(messages=[], response_metadata={"next_cursor": ""})
+        return 200, {}, response
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8", "replace")
+                try:
+                    args = json.loads(raw) if raw.startswith("{") else {key: value[0] for key, value in parse_qs(raw).items()}
+                except ValueError:
+                    args = {}
+
+                status, headers, response = fake.respond(self.path.rstrip("/").split("/")[-1], args)
+                body = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(name, []).append(seconds)
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return len(self._samples.get(name, []))
+
+    def samples(self, name: str) -> List[float]:
+        with self._lock:
+            return list(self._samples.get(name, []))
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - started_at)
+        return wrapper
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def wait_until(condition: Callable[[], bool], timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+def shortcut_body(index: int) -> Dict[str, Any]:
+    user_id = f"U{index % 200:07d}"
+    return {
+        "type": "message_action",
+        "callback_id": "delete_my_message",
+        "trigger_id": f"trigger-{index}",
+        "action_ts": f"{time.time():.6f}",
+        "team": {"id": "T0000001"},
+        "user": {"id": user_id, "name": user_id},
+        "channel": {"id": CHANNELS[index % len(CHANNELS)]},
+        "message": {"type": "message", "user": user_id, "ts": f"1600000000.{index:06d}", "text": f"Benchmark message {index}"},
+        "response_url": "https://example.invalid/response",
+    }
+
+def reaction_body(index: int, admin_message_ts: str, reaction: str) -> Dict[str, Any]:
+    return {
+        "type": "event_callback",
+        "team_id": "T0000001",
+        "event_id": f"EvBench{index:07d}",
+        "event_time": int(time.time()),
+        "event": {
+            "type": "reaction_added",
+            "user": ADMIN_ID,
+            "reaction": reaction,
+            "item": {"type": "message", "channel": ADMIN_CHANNEL, "ts": admin_message_ts},
+            "event_ts": f"{time.time():.6f}",
+        },
+    }
+
+def approve_body(request: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "block_actions",
+        "team": {"id": "T0000001"},
+        "user": {"id": ADMIN_ID, "name": "admin"},
+        "channel": {"id": ADMIN_CHANNEL},
+        "trigger_id": f"trigger-approve-{request['id']}",
+        "message": {
+            "ts": request["admin_message_ts"],
+            "blocks": [
+                {"type": "section", "text": {"type": "mrkdwn", "text": "Deletion request"}},
+                {"type": "actions", "elements": []},
+            ],
+        },
+        "actions": [{
+            "type": "button",
+            "action_id": "approve_deletion",
+            "block_id": "review",
+            "action_ts": f"{time.time():.6f}",
+            "value": f"{request['id']}|{request['message_ts']}|{request['requester_id']}",
+        }],
+    }
+
+def configure_environment(args, api_url: str, database_url: str):
+    os.environ.update({
+        "SLACK_BOT_TOKEN": "xoxb-benchmark",
+        "SLACK_USER_TOKEN": "xoxp-benchmark",
+        "SLACK_SIGNING_SECRET": "benchmark",
+        "SLACK_APP_TOKEN": "xapp-benchmark",
+        "SLACK_API_URL": api_url,
+        "ADMIN_USER_IDS": ADMIN_ID,
+        "ADMIN_REVIEW_CHANNEL": ADMIN_CHANNEL,
+        "AUDIT_LOG_CHANNEL": AUDIT_CHANNEL,
+        "DATABASE_URL": database_url,
+        "RATE_LIMIT_ENABLED": "true" if args.rate_limit else "false",
+        "AUTO_APPROVE_MINUTES": "0",
+        "RETENTION_DAYS": "0",
+        "MULTI_WORKER": "false",
+        "METRICS_ENABLED": "false",
+    })
+
+def db_seconds(database) -> float:
+    return sum(value for name, _, value in database.query_seconds.samples() if name.endswith("_sum"))
+
+def run_phase(name: str, app, fake: FakeSlack, recorder: Recorder, bodies: List[Dict[str, Any]], concurrency: int, done: Callable[[], bool], timeout: float) -> Dict[str, Any]:
+    from slack_bolt.request import BoltRequest
+
+    before_calls = fake.snapshot()
+    before_db = db_seconds(app.database)
+    failures = Counter()
+
+    def dispatch(body):
+        started_at = time.perf_counter()
+        response = app.app.dispatch(BoltRequest(body=body, mode="socket_mode"))
+        recorder.record(f"{name}.ack", time.perf_counter() - started_at)
+        if response.status != 200:
+            failures[response.status] += 1
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(dispatch, bodies))
+    completed = wait_until(done, timeout)
+    app.notifier.flush()
+    elapsed = time.perf_counter() - started_at
+
+    after_calls = fake.snapshot()
+    calls = after_calls["calls"] - before_calls["calls"]
+    count = len(bodies)
+    return {
+        "phase": name,
+        "requests": count,
+        "completed": completed,
+        "seconds": elapsed,
+        "throughput": count / elapsed if elapsed else 0.0,
+        "ack_p50_ms": percentile(recorder.samples(f"{name}.ack"), 0.50) * 1000,
+        "ack_p99_ms": percentile(recorder.samples(f"{name}.ack"), 0.99) * 1000,
+        "process_p50_ms": percentile(recorder.samples(name), 0.50) * 1000,
+        "process_p99_ms": percentile(recorder.samples(name), 0.99) * 1000,
+        "api_calls": sum(calls.values()),
+        "api_calls_per_request": sum(calls.values()) / count if count else 0.0,
+        "api_calls_by_method": dict(calls.most_common()),
+        "injected_errors": sum((after_calls["errors"] - before_calls["errors"]).values()),
+        "injected_ratelimits": sum((after_calls["ratelimited"] - before_calls["ratelimited"]).values()),
+        "db_ms_per_request": (db_seconds(app.database) - before_db) * 1000 / count if count else 0.0,
+        "dispatch_failures": dict(failures),
+    }
+
+def run(args) -> List[Dict[str, Any]]:
+    fake = FakeSlack(args.latency_ms, args.error_rate, args.ratelimit_rate, args.retry_after, args.seed)
+    fake.start()
+    workdir = tempfile.TemporaryDirectory(prefix="slack-cleaner-bench-")
+    configure_environment(args, fake.url, args.database_url or f"sqlite:///{os.path.join(workdir.name, 'benchmark.db')}")
+
+    import app
+
+    recorder = Recorder()
+    app.process_message_shortcut = recorder.wrap("shortcut", app.process_message_shortcut)
+    app.process_reaction_added = recorder.wrap("review", app.process_reaction_added)
+    app.process_approve_deletion = recorder.wrap("review", app.process_approve_deletion)
+    app.deletion_worker._run = recorder.wrap("deletion", app.deletion_worker._run)
+    app.notifier.start()
+    app.deletion_worker.start()
+    fake.injecting = True
+
+    results = []
+    try:
+        bodies = [shortcut_body(index) for index in range(args.requests)]
+        results.append(run_phase(
+            "shortcut", app, fake, recorder, bodies, args.concurrency,
+            lambda: recorder.count("shortcut") >= len(bodies), args.timeout
+        ))
+
+        pending = app.database.get_pending_requests(limit=args.requests)
+        bodies = []
+        for index, request in enumerate(pending):
+            if random.Random(args.seed + index).random() < args.deny_ratio:
+                bodies.append(reaction_body(index, request["admin_message_ts"], "x"))
+            elif index % 2:
+                bodies.append(approve_body(request))
+            else:
+                bodies.append(reaction_body(index, request["admin_message_ts"], "white_check_mark"))
+
+        def reviews_done():
+            if recorder.count("review") < len(bodies):
+                return False
+            jobs = app.database.get_queue_depths()["jobs"]
+            return not jobs.get("queued") and not jobs.get("running")
+
+        results.append(run_phase("review", app, fake, recorder, bodies, args.concurrency, reviews_done, args.timeout))
+        results[-1]["deletion_jobs"] = recorder.count("deletion")
+        results[-1]["deletion_p50_ms"] = percentile(recorder.samples("deletion"), 0.50) * 1000
+        results[-1]["deletion_p99_ms"] = percentile(recorder.samples("deletion"), 0.99) * 1000
+        results[-1]["final_statuses"] = app.database.get_queue_depths()["requests"]
+    finally:
+        app.deletion_worker.stop()
+        app.handler_pool.shutdown()
+        app.notifier.stop()
+        app.database.close_db()
+        fake.stop()
+        workdir.cleanup()
+
+    return results
+
+def print_report(results: List[Dict[str, Any]]):
+    for result in results:
+        print(f"\n== {result['phase']} ({result['requests']} requests{'' if result['completed'] else ', TIMED OUT'})")
+        print(f"  wall time        {result['seconds']:.2f}s ({result['throughput']:.1f} req/s)")
+        print(f"  ack latency      p50 {result['ack_p50_ms']:.1f}ms  p99 {result['ack_p99_ms']:.1f}ms")
+        print(f"  handler latency  p50 {result['process_p50_ms']:.1f}ms  p99 {result['process_p99_ms']:.1f}ms")
+        if "deletion_jobs" in result:
+            print(f"  deletion jobs    {result['deletion_jobs']} runs, p50 {result['deletion_p50_ms']:.1f}ms  p99 {result['deletion_p99_ms']:.1f}ms")
+        print(f"  Slack API calls  {result['api_calls']} ({result['api_calls_per_request']:.2f} per request)")
+        print(f"  injected         {result['injected_errors']} errors, {result['injected_ratelimits']} ratelimited")
+        print(f"  DB time          {result['db_ms_per_request']:.2f}ms per request")
+        print("  calls by method  " + ", ".join(f"{method}={count}" for method, count in result["api_calls_by_method"].items()))
+        if result.get("final_statuses"):
+            print("  final statuses   " + ", ".join(f"{status}={count}" for status, count in sorted(result["final_statuses"].items())))
+        if result["dispatch_failures"]:
+            print(f"  dispatch errors  {result['dispatch_failures']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the Bolt listeners against a local fake Slack API and a throwaway database")
+    parser.add_argument("--requests", "-n", type=int, default=1000, help="Deletion requests to submit")
+    parser.add_argument("--concurrency", "-c", type=int, default=16, help="Events dispatched at the same time")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latency added to every fake Slack API response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of Slack API calls answered with internal_error")
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0, help="Fraction of Slack API calls answered with HTTP 429 ratelimited")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with injected rate limits")
+    parser.add_argument("--deny-ratio", type=float, default=0.1, help="Fraction of requests denied instead of approved")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep client-side rate limit pacing on (chat.postMessage is paced to 1/s per channel)")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for each phase to finish")
+    parser.add_argument("--database-url", help="Run against this database instead of a temporary SQLite file; it should be empty and disposable")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for error injection and review decisions")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--log-level", default="ERROR", help="Log level for the app while the benchmark runs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    results = run(args)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(results)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
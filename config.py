@@ -1,4 +1,5 @@
 import os
+import socket
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,6 +8,7 @@ SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_USER_TOKEN = os.environ.get("SLACK_USER_TOKEN")
 SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET")
 SLACK_APP_TOKEN = os.environ.get("SLACK_APP_TOKEN")
+SLACK_API_URL = os.environ.get("SLACK_API_URL", "https://slack.com/api/")
 
 ADMIN_USER_IDS = set(os.environ.get("ADMIN_USER_IDS", "").split(","))
 ADMIN_REVIEW_CHANNEL = os.environ.get("ADMIN_REVIEW_CHANNEL")
@@ -15,14 +17,78 @@ AUDIT_LOG_CHANNEL = os.environ.get("AUDIT_LOG_CHANNEL")
 ALLOW_ALL_CHANNEL_MEMBERS = os.environ.get("ALLOW_ALL_CHANNEL_MEMBERS", "false").lower() == "true"
 
 PORT = int(os.environ.get("PORT", 3000))
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_QUEUE_DEPTH_SECONDS = int(os.environ.get("METRICS_QUEUE_DEPTH_SECONDS", 15))
 
 AUTO_APPROVE_MINUTES = int(os.environ.get("AUTO_APPROVE_MINUTES", 0))
 
+DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", 8))
+DATABASE_BUSY_TIMEOUT_MS = int(os.environ.get("DATABASE_BUSY_TIMEOUT_MS", 5000))
+DATABASE_SYNCHRONOUS = os.environ.get("DATABASE_SYNCHRONOUS", "NORMAL").upper()
+DATABASE_STATEMENT_CACHE_SIZE = int(os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", 256))
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+MIGRATION_BATCH_SIZE = int(os.environ.get("MIGRATION_BATCH_SIZE", 1000))
+
+MULTI_WORKER = os.environ.get("MULTI_WORKER", "false").lower() == "true"
+INSTANCE_ID = os.environ.get("INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+LEADER_LEASE_SECONDS = int(os.environ.get("LEADER_LEASE_SECONDS", 30))
+DELIVERY_DEDUP_SECONDS = int(os.environ.get("DELIVERY_DEDUP_SECONDS", 3600))
+DELIVERY_DEDUP_CACHE_SIZE = int(os.environ.get("DELIVERY_DEDUP_CACHE_SIZE", 10000))
+DELIVERY_DEDUP_PERSIST = os.environ.get("DELIVERY_DEDUP_PERSIST", str(MULTI_WORKER)).lower() == "true"
+
+HANDLER_WORKERS = int(os.environ.get("HANDLER_WORKERS", 8))
+HANDLER_QUEUE_SIZE = int(os.environ.get("HANDLER_QUEUE_SIZE", 100))
+
+DELETION_JOB_CONCURRENCY = int(os.environ.get("DELETION_JOB_CONCURRENCY", 4))
+DELETION_JOB_MAX_ATTEMPTS = int(os.environ.get("DELETION_JOB_MAX_ATTEMPTS", 5))
+DELETION_JOB_BACKOFF_SECONDS = int(os.environ.get("DELETION_JOB_BACKOFF_SECONDS", 5))
+DELETION_JOB_MAX_BACKOFF_SECONDS = int(os.environ.get("DELETION_JOB_MAX_BACKOFF_SECONDS", 300))
+DELETION_JOB_STALE_SECONDS = int(os.environ.get("DELETION_JOB_STALE_SECONDS", 3600))
+FILE_DELETE_CONCURRENCY = int(os.environ.get("FILE_DELETE_CONCURRENCY", 4))
+MESSAGE_DELETE_CONCURRENCY = int(os.environ.get("MESSAGE_DELETE_CONCURRENCY", 4))
+DELETION_JOB_POLL_SECONDS = int(os.environ.get("DELETION_JOB_POLL_SECONDS", 30))
+
+BATCH_MAX_MESSAGES = int(os.environ.get("BATCH_MAX_MESSAGES", 100))
+
+BULK_MAX_REQUESTS = int(os.environ.get("BULK_MAX_REQUESTS", 500))
+PURGE_PROGRESS_SECONDS = float(os.environ.get("PURGE_PROGRESS_SECONDS", 10))
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_MAX_RETRIES = int(os.environ.get("RATE_LIMIT_MAX_RETRIES", 3))
+
+METADATA_CACHE_SIZE = int(os.environ.get("METADATA_CACHE_SIZE", 5000))
+METADATA_CACHE_TTL_SECONDS = int(os.environ.get("METADATA_CACHE_TTL_SECONDS", 86400))
+METADATA_CACHE_PERSIST = os.environ.get("METADATA_CACHE_PERSIST", "true").lower() == "true"
+
+HOME_PAGE_SIZE = int(os.environ.get("HOME_PAGE_SIZE", 15))
+HOME_CACHE_SIZE = int(os.environ.get("HOME_CACHE_SIZE", 1000))
+HOME_CACHE_SECONDS = int(os.environ.get("HOME_CACHE_SECONDS", 30))
+HOME_PUBLISHED_HASH_SECONDS = int(os.environ.get("HOME_PUBLISHED_HASH_SECONDS", 86400))
+HOME_REFRESH_DEBOUNCE_SECONDS = float(os.environ.get("HOME_REFRESH_DEBOUNCE_SECONDS", 5))
+
+NOTIFY_DIGEST_SECONDS = float(os.environ.get("NOTIFY_DIGEST_SECONDS", 10))
+NOTIFY_DIGEST_MAX_ENTRIES = int(os.environ.get("NOTIFY_DIGEST_MAX_ENTRIES", 20))
+
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", 0))
+RETENTION_MODE = os.environ.get("RETENTION_MODE", "redact").lower()
+RETENTION_BATCH_SIZE = int(os.environ.get("RETENTION_BATCH_SIZE", 500))
+RETENTION_INTERVAL_HOURS = float(os.environ.get("RETENTION_INTERVAL_HOURS", 24))
+RETENTION_VACUUM_PAGES = int(os.environ.get("RETENTION_VACUUM_PAGES", 2000))
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 500))
+
+REQUEST_CACHE_SIZE = int(os.environ.get("REQUEST_CACHE_SIZE", 1000))
+REQUEST_CACHE_TTL_SECONDS = int(os.environ.get("REQUEST_CACHE_TTL_SECONDS", 300))
+
 def is_admin(user_id: str) -> bool:
     if ALLOW_ALL_CHANNEL_MEMBERS:
         return True
     return user_id in ADMIN_USER_IDS
 
+def is_listed_admin(user_id: str) -> bool:
+    return user_id in ADMIN_USER_IDS
+
 def validate_config():
     required = {
         "SLACK_BOT_TOKEN": SLACK_BOT_TOKEN,
@@ -38,4 +104,16 @@ def validate_config():
         raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
     if not ALLOW_ALL_CHANNEL_MEMBERS and (not ADMIN_USER_IDS or not list(ADMIN_USER_IDS)[0]):
-        raise ValueError("At least one admin user ID must be configured in ADMIN_USER_IDS (or set ALLOW_ALL_CHANNEL_MEMBERS=true)")
\ No newline at end of file
+        raise ValueError("At least one admin user ID must be configured in ADMIN_USER_IDS (or set ALLOW_ALL_CHANNEL_MEMBERS=true)")
+
+    if DATABASE_SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+        raise ValueError("DATABASE_SYNCHRONOUS must be one of OFF, NORMAL, FULL, EXTRA")
+
+    if DATABASE_POOL_SIZE < 1:
+        raise ValueError("DATABASE_POOL_SIZE must be at least 1")
+
+    if RETENTION_MODE not in ("redact", "archive"):
+        raise ValueError("RETENTION_MODE must be either redact or archive")
+
+    if MULTI_WORKER and not DATABASE_URL.startswith(("postgres://", "postgresql://")):
+        raise ValueError("MULTI_WORKER requires a PostgreSQL DATABASE_URL; SQLite allows only one writer at a time")
\ No newline at end of file
@@ -1,61 +1,249 @@
-import sqlite3
+import hashlib
 import json
-from datetime import datetime
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterator, Optional
+
+import cache
+import config
+import metrics
+import schema
+import storage
 
 DATABASE_PATH = "deletion_requests.db"
+POOL_RECHECK_SECONDS = 0.1
+
+logger = logging.getLogger(__name__)
+
+class DuplicateRequestError(Exception):
+    pass
+
+_backend = storage.create_backend(config.DATABASE_URL, DATABASE_PATH)
+_shared = _backend.shared or config.MULTI_WORKER
+
+_pool: "queue.LifoQueue[Any]" = queue.LifoQueue()
+_pool_lock = threading.Lock()
+_pool_size = 0
+
+_pending_lock = threading.Lock()
+_pending_by_admin_ts: Dict[str, int] = {}
+_pending_by_id: Dict[int, str] = {}
+_request_cache = cache.TTLCache(config.REQUEST_CACHE_SIZE, config.REQUEST_CACHE_TTL_SECONDS)
+
+_change_listeners: list[Callable[[], None]] = []
+
+query_seconds = metrics.Histogram(
+    "slack_cleaner_db_seconds",
+    "Time spent in database transactions, by operation",
+    ["operation"]
+)
+pool_wait_seconds = metrics.Histogram(
+    "slack_cleaner_db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection"
+)
+
+def _acquire():
+    global _pool_size
+    deadline = time.monotonic() + config.DATABASE_BUSY_TIMEOUT_MS / 1000
+    while True:
+        try:
+            return _pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with _pool_lock:
+            can_grow = _pool_size < config.DATABASE_POOL_SIZE
+            if can_grow:
+                _pool_size += 1
+
+        if can_grow:
+            try:
+                return _backend.connect()
+            except Exception:
+                with _pool_lock:
+                    _pool_size -= 1
+                raise
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"No database connection became free within {config.DATABASE_BUSY_TIMEOUT_MS} ms ({config.DATABASE_POOL_SIZE} in use)")
+
+        try:
+            return _pool.get(timeout=min(remaining, POOL_RECHECK_SECONDS))
+        except queue.Empty:
+            continue
+
+def _discard(conn):
+    global _pool_size
+    try:
+        conn.close()
+    except _backend.Error:
+        pass
+    with _pool_lock:
+        _pool_size -= 1
 
 @contextmanager
-def get_db():
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+def get_db(operation: str = "query"):
+    started_at = time.perf_counter()
+    conn = _acquire()
+    acquired_at = time.perf_counter()
+    pool_wait_seconds.observe(acquired_at - started_at)
     try:
         yield conn
         conn.commit()
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except _backend.Error:
+            _discard(conn)
+            raise
+        _pool.put(conn)
         raise
+    else:
+        _pool.put(conn)
     finally:
+        query_seconds.observe(time.perf_counter() - acquired_at, operation)
+
+def _collect_pool_stats():
+    with _pool_lock:
+        size = _pool_size
+    yield "slack_cleaner_db_connections", "gauge", "Database connections open in the pool", [({}, size)]
+    yield "slack_cleaner_db_connections_idle", "gauge", "Database connections idle in the pool", [({}, _pool.qsize())]
+
+metrics.register_collector(_collect_pool_stats)
+
+def close_db():
+    global _pool_size
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
         conn.close()
+        with _pool_lock:
+            _pool_size -= 1
 
 def init_db():
-    with get_db() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS deletion_requests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                request_timestamp TEXT NOT NULL,
-                message_ts TEXT NOT NULL,
-                channel_id TEXT NOT NULL,
-                channel_name TEXT,
-                message_author_id TEXT NOT NULL,
-                message_author_name TEXT,
-                message_text TEXT NOT NULL,
-                requester_id TEXT NOT NULL,
-                requester_name TEXT,
-                status TEXT NOT NULL DEFAULT 'pending',
-                admin_id TEXT,
-                admin_name TEXT,
-                action_timestamp TEXT,
-                admin_message_ts TEXT,
-                notes TEXT
-            )
-        """)
+    with _backend.migration_lock():
+        with get_db("init_db") as conn:
+            if not _backend.columns(conn, "schema_version") and not _backend.columns(conn, "deletion_requests"):
+                _backend.configure_new_database(conn)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TEXT NOT NULL
+                )
+            """)
+            applied = _applied_migrations(conn)
+            fresh = not applied and not _backend.columns(conn, "deletion_requests")
 
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_request_timestamp
-            ON deletion_requests(request_timestamp)
-        """)
+        for migration in schema.MIGRATIONS:
+            if migration.version in applied or (migration.background and not fresh):
+                continue
+            apply_migration(migration)
+
+        pending = [migration.name for migration in schema.MIGRATIONS if migration.background and migration.version not in get_applied_migrations()]
+        if pending:
+            logger.info(f"Background schema migrations pending: {', '.join(pending)}")
+
+    if _shared:
+        requeue_before = datetime.utcnow() - timedelta(seconds=config.DELETION_JOB_STALE_SECONDS)
+    else:
+        requeue_before = datetime.max
 
+    with get_db("init_db") as conn:
         conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_status
-            ON deletion_requests(status)
-        """)
+            UPDATE deletion_jobs
+            SET state = 'queued'
+            WHERE state = 'running' AND updated_at < ?
+        """, (requeue_before.isoformat(),))
+
+        rows = conn.execute("""
+            SELECT id, admin_message_ts FROM deletion_requests
+            WHERE status = 'pending' AND admin_message_ts IS NOT NULL
+        """).fetchall()
+
+    with _pending_lock:
+        _pending_by_admin_ts.clear()
+        _pending_by_id.clear()
+        _request_cache.clear()
+        for row in rows:
+            _pending_by_admin_ts[row["admin_message_ts"]] = row["id"]
+            _pending_by_id[row["id"]] = row["admin_message_ts"]
+
+def _applied_migrations(conn) -> set[int]:
+    return {row["version"] for row in conn.execute("SELECT version FROM schema_version").fetchall()}
+
+def get_applied_migrations() -> set[int]:
+    with get_db("get_applied_migrations") as conn:
+        return _applied_migrations(conn)
+
+def _run_migration_step(conn, step: schema.Step, online: bool):
+    if callable(step):
+        step(conn, _backend)
+    elif online:
+        _backend.build_index(conn, step)
+    else:
+        conn.execute(_backend.ddl(step))
+
+def apply_migration(migration: schema.Migration, between_chunks: Optional[Callable[[], bool]] = None) -> bool:
+    operation = f"migration_{migration.version}"
+    if migration.background:
+        for step in migration.steps:
+            with get_db(operation) as conn:
+                _run_migration_step(conn, step, online=True)
 
+        while migration.backfill:
+            with get_db(operation) as conn:
+                count = migration.backfill(conn, config.MIGRATION_BATCH_SIZE)
+            if count < config.MIGRATION_BATCH_SIZE:
+                break
+            if between_chunks and not between_chunks():
+                return False
+
+    with get_db(operation) as conn:
+        if not migration.background:
+            for step in migration.steps:
+                _run_migration_step(conn, step, online=False)
         conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_message_author
-            ON deletion_requests(message_author_id)
-        """)
+            INSERT INTO schema_version (version, name, applied_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT DO NOTHING
+        """, (migration.version, migration.name, datetime.utcnow().isoformat()))
+
+    logger.info(f"Applied schema migration {migration.version} ({migration.name})")
+    return True
+
+def on_request_change(listener: Callable[[], None]):
+    _change_listeners.append(listener)
+
+def _notify_change():
+    for listener in _change_listeners:
+        try:
+            listener()
+        except Exception as e:
+            logger.error(f"Error in request change listener: {e}")
+
+def _track_pending(request_id: int, admin_message_ts: Optional[str]):
+    _notify_change()
+    if not admin_message_ts:
+        return
+    with _pending_lock:
+        _pending_by_admin_ts[admin_message_ts] = request_id
+        _pending_by_id[request_id] = admin_message_ts
+
+def _forget_pending(request_id: int):
+    _notify_change()
+    with _pending_lock:
+        admin_message_ts = _pending_by_id.pop(request_id, None)
+        if admin_message_ts is not None:
+            _pending_by_admin_ts.pop(admin_message_ts, None)
+            _request_cache.pop(admin_message_ts, None)
 
 def create_deletion_request(
     message_ts: str,
@@ -66,12 +254,27 @@ def create_deletion_request(
     message_text: str,
     requester_id: str,
     requester_name: str,
-    admin_message_ts: str
+    admin_message_ts: str,
+    files: Optional[list[tuple[str, str, str, Optional[str]]]] = None
 ) -> int:
-    with get_db() as conn:
-        cursor = conn.execute("""
-            INSERT INTO deletion_requests (
-                request_timestamp,
+    try:
+        with get_db("create_deletion_request") as conn:
+            cursor = conn.execute("""
+                INSERT INTO deletion_requests (
+                    request_timestamp,
+                    message_ts,
+                    channel_id,
+                    channel_name,
+                    message_author_id,
+                    message_author_name,
+                    message_text,
+                    requester_id,
+                    requester_name,
+                    admin_message_ts
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
+            """, (
+                datetime.utcnow().isoformat(),
                 message_ts,
                 channel_id,
                 channel_name,
@@ -81,9 +284,85 @@ def create_deletion_request(
                 requester_id,
                 requester_name,
                 admin_message_ts
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.utcnow().isoformat(),
+            ))
+            request_id = cursor.fetchone()["id"]
+            _insert_request_files(conn, [(request_id, *file) for file in files or []])
+    except _backend.IntegrityError as e:
+        raise DuplicateRequestError(f"A deletion request for message {message_ts} is already open") from e
+
+    _track_pending(request_id, admin_message_ts)
+    return request_id
+
+def create_batch_deletion_request(
+    thread_ts: str,
+    channel_id: str,
+    channel_name: str,
+    message_author_id: str,
+    message_author_name: str,
+    messages: list[tuple[str, str]],
+    requester_id: str,
+    requester_name: str,
+    admin_message_ts: str,
+    files: Optional[Dict[str, list[tuple[str, str, str, Optional[str]]]]] = None
+) -> int:
+    now = datetime.utcnow().isoformat()
+    try:
+        with get_db("create_batch_deletion_request") as conn:
+            cursor = conn.execute("""
+                INSERT INTO deletion_requests (
+                    request_timestamp,
+                    message_ts,
+                    channel_id,
+                    channel_name,
+                    message_author_id,
+                    message_author_name,
+                    message_text,
+                    requester_id,
+                    requester_name,
+                    admin_message_ts,
+                    request_type
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'thread_replies')
+                RETURNING id
+            """, (
+                now,
+                thread_ts,
+                channel_id,
+                channel_name,
+                message_author_id,
+                message_author_name,
+                f"[{len(messages)} thread replies]",
+                requester_id,
+                requester_name,
+                admin_message_ts
+            ))
+            parent_id = cursor.fetchone()["id"]
+
+            inserted = _insert_child_requests(conn, parent_id, now, messages, files)
+            if not inserted:
+                raise DuplicateRequestError(f"Every reply in thread {thread_ts} already has an open deletion request")
+    except _backend.IntegrityError as e:
+        raise DuplicateRequestError(f"A deletion request for thread {thread_ts} is already open") from e
+
+    _track_pending(parent_id, admin_message_ts)
+    return parent_id
+
+def _insert_child_requests(
+    conn,
+    parent_id: int,
+    request_timestamp: str,
+    messages: list[tuple[str, str]],
+    files: Optional[Dict[str, list[tuple[str, str, str, Optional[str]]]]] = None
+) -> int:
+    if not messages:
+        return 0
+
+    parent = conn.execute("""
+        SELECT * FROM deletion_requests WHERE id = ?
+    """, (parent_id,)).fetchone()
+
+    inserted = conn.executemany("""
+        INSERT INTO deletion_requests (
+            request_timestamp,
             message_ts,
             channel_id,
             channel_name,
@@ -92,52 +371,907 @@ def create_deletion_request(
             message_text,
             requester_id,
             requester_name,
-            admin_message_ts
-        ))
-        return cursor.lastrowid
+            parent_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT DO NOTHING
+    """, [
+        (
+            request_timestamp,
+            message_ts,
+            parent["channel_id"],
+            parent["channel_name"],
+            parent["message_author_id"],
+            parent["message_author_name"],
+            message_text,
+            parent["requester_id"],
+            parent["requester_name"],
+            parent_id
+        )
+        for message_ts, message_text in messages
+    ]).rowcount
+
+    if inserted and files:
+        placeholders = ", ".join("?" for _ in messages)
+        children = conn.execute(f"""
+            SELECT id, message_ts FROM deletion_requests
+            WHERE parent_id = ? AND message_ts IN ({placeholders})
+        """, (parent_id, *[message_ts for message_ts, _ in messages])).fetchall()
+        _insert_request_files(conn, [
+            (child["id"], *file)
+            for child in children
+            for file in files.get(child["message_ts"], [])
+        ])
+
+    return inserted
+
+def _insert_request_files(conn, rows: list[tuple[int, str, str, str, Optional[str]]]):
+    if not rows:
+        return
+    now = datetime.utcnow().isoformat()
+    conn.executemany("""
+        INSERT INTO deletion_request_files (request_id, file_id, file_name, status, error, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT DO NOTHING
+    """, [(*row, now) for row in rows])
+
+def get_request_files(request_ids: list[int]) -> list[Dict[str, Any]]:
+    if not request_ids:
+        return []
+
+    placeholders = ", ".join("?" for _ in request_ids)
+    with get_db("get_request_files") as conn:
+        rows = conn.execute(f"""
+            SELECT * FROM deletion_request_files
+            WHERE request_id IN ({placeholders})
+            ORDER BY request_id, file_id
+        """, request_ids).fetchall()
+
+        return [dict(row) for row in rows]
+
+def get_child_ids_with_pending_files(parent_id: int) -> list[int]:
+    with get_db("get_child_ids_with_pending_files") as conn:
+        rows = conn.execute("""
+            SELECT DISTINCT deletion_request_files.request_id
+            FROM deletion_request_files
+            JOIN deletion_requests ON deletion_requests.id = deletion_request_files.request_id
+            WHERE deletion_requests.parent_id = ? AND deletion_request_files.status = 'pending'
+        """, (parent_id,)).fetchall()
+
+        return [row["request_id"] for row in rows]
+
+def update_request_files(updates: list[tuple[int, str, str, Optional[str]]]):
+    if not updates:
+        return
+
+    now = datetime.utcnow().isoformat()
+    with get_db("update_request_files") as conn:
+        conn.executemany("""
+            UPDATE deletion_request_files
+            SET status = ?,
+                error = ?,
+                attempts = attempts + 1,
+                updated_at = ?
+            WHERE request_id = ? AND file_id = ?
+        """, [(status, error, now, request_id, file_id) for request_id, file_id, status, error in updates])
 
 def update_deletion_request(
     request_id: int,
     status: str,
     admin_id: str,
     admin_name: str,
-    notes: Optional[str] = None
-):
-    with get_db() as conn:
-        conn.execute("""
+    notes: Optional[str] = None,
+    expected_status: Optional[str] = None
+) -> bool:
+    action_timestamp = datetime.utcnow().isoformat()
+    query = """
+        UPDATE deletion_requests
+        SET status = ?,
+            admin_id = ?,
+            admin_name = ?,
+            action_timestamp = ?,
+            notes = ?
+        WHERE id = ?
+    """
+    params = [status, admin_id, admin_name, action_timestamp, notes, request_id]
+    if expected_status:
+        query += " AND status = ?"
+        params.append(expected_status)
+
+    with get_db("update_deletion_request") as conn:
+        updated = conn.execute(query, params).rowcount
+
+        if updated:
+            conn.execute("""
+                UPDATE deletion_requests
+                SET status = ?,
+                    admin_id = ?,
+                    admin_name = ?,
+                    action_timestamp = ?,
+                    notes = ?
+                WHERE parent_id = ? AND status = 'pending'
+            """, (
+                status,
+                admin_id,
+                admin_name,
+                action_timestamp,
+                notes,
+                request_id
+            ))
+
+    if updated and status != "pending":
+        _forget_pending(request_id)
+
+    return bool(updated)
+
+def get_deletion_request_by_admin_message(admin_message_ts: str) -> Optional[Dict[str, Any]]:
+    with get_db("get_deletion_request_by_admin_message") as conn:
+        row = conn.execute("""
+            SELECT * FROM deletion_requests
+            WHERE admin_message_ts = ?
+        """, (admin_message_ts,)).fetchone()
+
+        if row:
+            return dict(row)
+        return None
+
+def get_recent_requests(
+    limit: int = 50,
+    before: Optional[tuple[str, int]] = None,
+    status: Optional[str] = None,
+    channel_id: Optional[str] = None,
+    author_id: Optional[str] = None,
+    include_children: bool = True
+) -> list[Dict[str, Any]]:
+    query = "SELECT * FROM deletion_requests WHERE 1 = 1"
+    params: list[Any] = []
+
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    if channel_id:
+        query += " AND channel_id = ?"
+        params.append(channel_id)
+    if author_id:
+        query += " AND message_author_id = ?"
+        params.append(author_id)
+    if not include_children:
+        query += " AND parent_id IS NULL"
+    if before:
+        query += " AND (request_timestamp, id) < (?, ?)"
+        params.extend(before)
+
+    query += " ORDER BY request_timestamp DESC, id DESC LIMIT ?"
+    params.append(limit)
+
+    with get_db("get_recent_requests") as conn:
+        rows = conn.execute(query, params).fetchall()
+
+        return [dict(row) for row in rows]
+
+def iter_requests(
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    status: Optional[str] = None,
+    batch_size: int = 500
+) -> Iterator[Dict[str, Any]]:
+    query = "SELECT * FROM deletion_requests WHERE 1 = 1"
+    params: list[Any] = []
+
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    if since:
+        query += " AND request_timestamp >= ?"
+        params.append(since)
+    if until:
+        query += " AND request_timestamp < ?"
+        params.append(until)
+
+    query += " ORDER BY request_timestamp, id"
+
+    conn = _acquire()
+    cursor = None
+    try:
+        cursor = _backend.stream(conn, query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        try:
+            if cursor is not None:
+                cursor.close()
+            conn.rollback()
+        except _backend.Error:
+            _discard(conn)
+        else:
+            _pool.put(conn)
+
+def get_pending_request_by_admin_message(admin_message_ts: str) -> Optional[Dict[str, Any]]:
+    if _shared:
+        request = get_deletion_request_by_admin_message(admin_message_ts)
+        return request if request and request["status"] == "pending" else None
+
+    with _pending_lock:
+        if admin_message_ts not in _pending_by_admin_ts:
+            return None
+        cached = _request_cache.get(admin_message_ts)
+        if cached:
+            return dict(cached)
+
+    request = get_deletion_request_by_admin_message(admin_message_ts)
+
+    if not request or request["status"] != "pending":
+        if request:
+            _forget_pending(request["id"])
+        return None
+
+    with _pending_lock:
+        if admin_message_ts in _pending_by_admin_ts:
+            _request_cache.set(admin_message_ts, request)
+
+    return dict(request)
+
+def get_deletion_request(request_id: int) -> Optional[Dict[str, Any]]:
+    with get_db("get_deletion_request") as conn:
+        row = conn.execute("""
+            SELECT * FROM deletion_requests
+            WHERE id = ?
+        """, (request_id,)).fetchone()
+
+        if row:
+            return dict(row)
+        return None
+
+def get_open_request(
+    channel_id: str,
+    message_ts: str,
+    request_type: str = "message",
+    requester_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    query = """
+        SELECT * FROM deletion_requests
+        WHERE channel_id = ? AND message_ts = ? AND request_type = ?
+        AND status IN ('pending', 'processing')
+    """
+    params = [channel_id, message_ts, request_type]
+    if requester_id:
+        query += " AND requester_id = ?"
+        params.append(requester_id)
+
+    with get_db("get_open_request") as conn:
+        row = conn.execute(query, params).fetchone()
+
+        if row:
+            return dict(row)
+        return None
+
+def get_open_message_timestamps(channel_id: str, message_timestamps: list[str]) -> set[str]:
+    if not message_timestamps:
+        return set()
+
+    placeholders = ", ".join("?" for _ in message_timestamps)
+    with get_db("get_open_message_timestamps") as conn:
+        rows = conn.execute(f"""
+            SELECT message_ts FROM deletion_requests
+            WHERE channel_id = ? AND message_ts IN ({placeholders})
+            AND request_type = 'message' AND status IN ('pending', 'processing')
+        """, (channel_id, *message_timestamps)).fetchall()
+
+        return {row["message_ts"] for row in rows}
+
+def get_child_requests(parent_id: int) -> list[Dict[str, Any]]:
+    with get_db("get_child_requests") as conn:
+        rows = conn.execute("""
+            SELECT * FROM deletion_requests
+            WHERE parent_id = ?
+            ORDER BY message_ts
+        """, (parent_id,)).fetchall()
+
+        return [dict(row) for row in rows]
+
+def enqueue_deletion_job(
+    request_id: int,
+    admin_id: str,
+    admin_name: str,
+    payload: Optional[Dict[str, Any]] = None
+) -> Optional[int]:
+    now = datetime.utcnow().isoformat()
+    with get_db("enqueue_deletion_job") as conn:
+        claimed = conn.execute("""
             UPDATE deletion_requests
-            SET status = ?,
+            SET status = 'processing',
                 admin_id = ?,
                 admin_name = ?,
+                action_timestamp = ?
+            WHERE id = ? AND status = 'pending'
+        """, (admin_id, admin_name, now, request_id)).rowcount
+
+        if not claimed:
+            return None
+
+        cursor = conn.execute("""
+            INSERT INTO deletion_jobs (
+                request_id,
+                next_run_at,
+                admin_id,
+                admin_name,
+                payload,
+                created_at,
+                updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
+        """, (request_id, now, admin_id, admin_name, json.dumps(payload or {}), now, now))
+        job_id = cursor.fetchone()["id"]
+
+    _forget_pending(request_id)
+    return job_id
+
+def claim_deletion_jobs(limit: int) -> list[Dict[str, Any]]:
+    now = datetime.utcnow().isoformat()
+    with get_db("claim_deletion_jobs") as conn:
+        rows = conn.execute(f"""
+            UPDATE deletion_jobs
+            SET state = 'running',
+                attempts = attempts + 1,
+                updated_at = ?
+            WHERE id IN (
+                SELECT id FROM deletion_jobs
+                WHERE state = 'queued' AND next_run_at <= ?
+                ORDER BY next_run_at
+                LIMIT ?{_backend.lock_clause}
+            )
+            RETURNING *
+        """, (now, now, limit)).fetchall()
+
+    jobs = []
+    for row in rows:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"] or "{}")
+        jobs.append(job)
+    return jobs
+
+def get_next_deletion_job_time() -> Optional[datetime]:
+    with get_db("get_next_deletion_job_time") as conn:
+        row = conn.execute("""
+            SELECT MIN(next_run_at) AS next_run_at FROM deletion_jobs
+            WHERE state = 'queued'
+        """).fetchone()
+
+        if row and row["next_run_at"]:
+            return datetime.fromisoformat(row["next_run_at"])
+        return None
+
+def get_queue_depths() -> Dict[str, Dict[str, int]]:
+    with get_db("get_queue_depths") as conn:
+        jobs = conn.execute("""
+            SELECT state, COUNT(*) AS count FROM deletion_jobs GROUP BY state
+        """).fetchall()
+        requests = conn.execute("""
+            SELECT status, COUNT(*) AS count FROM deletion_requests GROUP BY status
+        """).fetchall()
+    return {
+        "jobs": {row["state"]: row["count"] for row in jobs},
+        "requests": {row["status"]: row["count"] for row in requests},
+    }
+
+def mark_deletion_job_message_deleted(job_id: int):
+    with get_db("mark_deletion_job_message_deleted") as conn:
+        conn.execute("""
+            UPDATE deletion_jobs
+            SET message_deleted = 1,
+                updated_at = ?
+            WHERE id = ?
+        """, (datetime.utcnow().isoformat(), job_id))
+
+def complete_deletion_job(job_id: int, request_id: int, status: str, notes: Optional[str] = None):
+    now = datetime.utcnow().isoformat()
+    with get_db("complete_deletion_job") as conn:
+        conn.execute("""
+            UPDATE deletion_jobs
+            SET state = ?,
+                last_error = ?,
+                updated_at = ?
+            WHERE id = ?
+        """, ("done" if status == "approved" else "failed", notes, now, job_id))
+
+        conn.execute("""
+            UPDATE deletion_requests
+            SET status = ?,
+                action_timestamp = ?,
+                notes = ?
+            WHERE id = ?
+        """, (status, now, notes, request_id))
+
+        conn.execute("""
+            UPDATE deletion_requests
+            SET status = 'error',
                 action_timestamp = ?,
                 notes = ?
+            WHERE parent_id = ? AND status = 'pending'
+        """, (now, notes, request_id))
+
+    _notify_change()
+
+def retry_deletion_job(job_id: int, error: str, next_run_at: datetime):
+    with get_db("retry_deletion_job") as conn:
+        conn.execute("""
+            UPDATE deletion_jobs
+            SET state = 'queued',
+                last_error = ?,
+                next_run_at = ?,
+                updated_at = ?
             WHERE id = ?
+        """, (error, next_run_at.isoformat(), datetime.utcnow().isoformat(), job_id))
+
+def create_purge_request(
+    channel_id: str,
+    channel_name: str,
+    author_id: str,
+    author_name: str,
+    admin_id: str,
+    admin_name: str,
+    admin_message_ts: str,
+    oldest: Optional[str] = None,
+    latest: Optional[str] = None
+) -> int:
+    now = datetime.utcnow().isoformat()
+    with get_db("create_purge_request") as conn:
+        cursor = conn.execute("""
+            INSERT INTO deletion_requests (
+                request_timestamp,
+                message_ts,
+                channel_id,
+                channel_name,
+                message_author_id,
+                message_author_name,
+                message_text,
+                requester_id,
+                requester_name,
+                status,
+                admin_id,
+                admin_name,
+                action_timestamp,
+                admin_message_ts,
+                request_type
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'processing', ?, ?, ?, ?, 'purge')
+            RETURNING id
         """, (
-            status,
+            now,
+            oldest or "0",
+            channel_id,
+            channel_name,
+            author_id,
+            author_name,
+            "[channel purge]",
+            admin_id,
+            admin_name,
             admin_id,
             admin_name,
-            datetime.utcnow().isoformat(),
-            notes,
-            request_id
+            now,
+            admin_message_ts
         ))
+        request_id = cursor.fetchone()["id"]
 
-def get_deletion_request_by_admin_message(admin_message_ts: str) -> Optional[Dict[str, Any]]:
-    with get_db() as conn:
+        conn.execute("""
+            INSERT INTO purge_jobs (
+                request_id,
+                oldest,
+                latest,
+                next_run_at,
+                created_at,
+                updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, (request_id, oldest, latest, now, now, now))
+
+    _notify_change()
+    return request_id
+
+def get_next_purge_job() -> Optional[Dict[str, Any]]:
+    with get_db("get_next_purge_job") as conn:
         row = conn.execute("""
-            SELECT * FROM deletion_requests
-            WHERE admin_message_ts = ?
-        """, (admin_message_ts,)).fetchone()
+            SELECT purge_jobs.*,
+                deletion_requests.channel_id,
+                deletion_requests.channel_name,
+                deletion_requests.message_author_id,
+                deletion_requests.message_author_name,
+                deletion_requests.admin_id,
+                deletion_requests.admin_name,
+                deletion_requests.admin_message_ts
+            FROM purge_jobs
+            JOIN deletion_requests ON deletion_requests.id = purge_jobs.request_id
+            WHERE purge_jobs.state = 'running'
+            ORDER BY purge_jobs.next_run_at
+            LIMIT 1
+        """).fetchone()
 
         if row:
             return dict(row)
         return None
 
-def get_recent_requests(limit: int = 50) -> list[Dict[str, Any]]:
-    with get_db() as conn:
+def add_purge_candidates(
+    request_id: int,
+    messages: list[tuple[str, str]],
+    files: Optional[Dict[str, list[tuple[str, str, str, Optional[str]]]]] = None
+) -> int:
+    with get_db("add_purge_candidates") as conn:
+        return _insert_child_requests(conn, request_id, datetime.utcnow().isoformat(), messages, files)
+
+def get_pending_child_requests(parent_id: int, message_timestamps: list[str]) -> list[Dict[str, Any]]:
+    if not message_timestamps:
+        return []
+
+    placeholders = ", ".join("?" for _ in message_timestamps)
+    with get_db("get_pending_child_requests") as conn:
+        rows = conn.execute(f"""
+            SELECT * FROM deletion_requests
+            WHERE parent_id = ? AND status = 'pending' AND message_ts IN ({placeholders})
+            ORDER BY message_ts
+        """, (parent_id, *message_timestamps)).fetchall()
+
+        return [dict(row) for row in rows]
+
+def count_child_requests(parent_id: int) -> Dict[str, int]:
+    with get_db("count_child_requests") as conn:
+        rows = conn.execute("""
+            SELECT status, COUNT(*) AS count FROM deletion_requests
+            WHERE parent_id = ?
+            GROUP BY status
+        """, (parent_id,)).fetchall()
+
+        return {row["status"]: row["count"] for row in rows}
+
+def advance_purge_job(job_id: int, cursor: Optional[str], scanned: int):
+    with get_db("advance_purge_job") as conn:
+        conn.execute("""
+            UPDATE purge_jobs
+            SET cursor = ?,
+                scanned = scanned + ?,
+                attempts = 0,
+                last_error = NULL,
+                updated_at = ?
+            WHERE id = ?
+        """, (cursor, scanned, datetime.utcnow().isoformat(), job_id))
+
+def retry_purge_job(job_id: int, error: str, next_run_at: datetime):
+    with get_db("retry_purge_job") as conn:
+        conn.execute("""
+            UPDATE purge_jobs
+            SET attempts = attempts + 1,
+                last_error = ?,
+                next_run_at = ?,
+                updated_at = ?
+            WHERE id = ?
+        """, (error, next_run_at.isoformat(), datetime.utcnow().isoformat(), job_id))
+
+def complete_purge_job(job_id: int, request_id: int, status: str, notes: Optional[str] = None):
+    now = datetime.utcnow().isoformat()
+    with get_db("complete_purge_job") as conn:
+        conn.execute("""
+            UPDATE purge_jobs
+            SET state = ?,
+                last_error = ?,
+                updated_at = ?
+            WHERE id = ?
+        """, ("done" if status == "approved" else "failed", notes, now, job_id))
+
+        conn.execute("""
+            UPDATE deletion_requests
+            SET status = ?,
+                action_timestamp = ?,
+                notes = ?
+            WHERE id = ?
+        """, (status, now, notes, request_id))
+
+        conn.execute("""
+            UPDATE deletion_requests
+            SET status = 'error',
+                action_timestamp = ?,
+                notes = ?
+            WHERE parent_id = ? AND status = 'pending'
+        """, (now, notes, request_id))
+
+    _notify_change()
+
+def get_pending_deadlines(after: Optional[str], limit: int) -> list[Dict[str, Any]]:
+    with get_db("get_pending_deadlines") as conn:
         rows = conn.execute("""
+            SELECT id, request_timestamp FROM deletion_requests
+            WHERE status = 'pending' AND request_timestamp > ? AND parent_id IS NULL
+            ORDER BY request_timestamp
+            LIMIT ?
+        """, (after or "", limit)).fetchall()
+
+        return [dict(row) for row in rows]
+
+def get_pending_requests(
+    channel_id: Optional[str] = None,
+    requester_id: Optional[str] = None,
+    older_than: Optional[datetime] = None,
+    limit: int = 500
+) -> list[Dict[str, Any]]:
+    query = """
+        SELECT *, (
+            SELECT COUNT(*) FROM deletion_requests AS children
+            WHERE children.parent_id = deletion_requests.id
+        ) AS child_count
+        FROM deletion_requests
+        WHERE status = 'pending' AND parent_id IS NULL
+    """
+    params: list[Any] = []
+
+    if channel_id:
+        query += " AND channel_id = ?"
+        params.append(channel_id)
+    if requester_id:
+        query += " AND requester_id = ?"
+        params.append(requester_id)
+    if older_than:
+        query += " AND request_timestamp <= ?"
+        params.append(older_than.isoformat())
+
+    query += " ORDER BY request_timestamp LIMIT ?"
+    params.append(limit)
+
+    with get_db("get_pending_requests") as conn:
+        rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+def deny_deletion_requests(request_ids: list[int], admin_id: str, admin_name: str) -> set[int]:
+    if not request_ids:
+        return set()
+
+    now = datetime.utcnow().isoformat()
+    placeholders = ", ".join("?" for _ in request_ids)
+    with get_db("deny_deletion_requests") as conn:
+        rows = conn.execute(f"""
+            UPDATE deletion_requests
+            SET status = 'denied',
+                admin_id = ?,
+                admin_name = ?,
+                action_timestamp = ?
+            WHERE id IN (
+                SELECT id FROM deletion_requests
+                WHERE id IN ({placeholders}) AND status = 'pending'{_backend.lock_clause}
+            )
+            RETURNING id
+        """, (admin_id, admin_name, now, *request_ids)).fetchall()
+
+        conn.executemany("""
+            UPDATE deletion_requests
+            SET status = 'denied',
+                admin_id = ?,
+                admin_name = ?,
+                action_timestamp = ?
+            WHERE parent_id = ? AND status = 'pending'
+        """, [(admin_id, admin_name, now, row["id"]) for row in rows])
+
+    denied = {row["id"] for row in rows}
+    for request_id in denied:
+        _forget_pending(request_id)
+    return denied
+
+def update_deletion_requests(
+    updates: list[tuple[int, str, Optional[str]]],
+    admin_id: str,
+    admin_name: str
+):
+    action_timestamp = datetime.utcnow().isoformat()
+    with get_db("update_deletion_requests") as conn:
+        conn.executemany("""
+            UPDATE deletion_requests
+            SET status = ?,
+                admin_id = ?,
+                admin_name = ?,
+                action_timestamp = ?,
+                notes = ?
+            WHERE id = ? AND status = 'pending'
+        """, [
+            (status, admin_id, admin_name, action_timestamp, notes, request_id)
+            for request_id, status, notes in updates
+        ])
+
+        conn.executemany("""
+            UPDATE deletion_requests
+            SET status = ?,
+                admin_id = ?,
+                admin_name = ?,
+                action_timestamp = ?,
+                notes = ?
+            WHERE parent_id = ? AND status = 'pending'
+        """, [
+            (status, admin_id, admin_name, action_timestamp, notes, request_id)
+            for request_id, status, notes in updates
+            if status != "pending"
+        ])
+
+    for request_id, status, _ in updates:
+        if status != "pending":
+            _forget_pending(request_id)
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def redact_requests(older_than: datetime, limit: int) -> int:
+    with get_db("redact_requests") as conn:
+        rows = conn.execute("""
+            SELECT id, message_text FROM deletion_requests
+            WHERE message_hash IS NULL AND request_timestamp < ?
+            AND status NOT IN ('pending', 'processing')
+            ORDER BY request_timestamp
+            LIMIT ?
+        """, (older_than.isoformat(), limit)).fetchall()
+
+        conn.executemany("""
+            UPDATE deletion_requests
+            SET message_text = '',
+                message_hash = ?
+            WHERE id = ?
+        """, [(_hash_text(row["message_text"]), row["id"]) for row in rows])
+
+        conn.executemany("""
+            UPDATE deletion_request_files
+            SET file_name = NULL
+            WHERE request_id = ?
+        """, [(row["id"],) for row in rows])
+
+    if rows:
+        _notify_change()
+    return len(rows)
+
+def archive_requests(older_than: datetime, limit: int) -> int:
+    with get_db("archive_requests") as conn:
+        parents = conn.execute("""
             SELECT * FROM deletion_requests
-            ORDER BY request_timestamp DESC
+            WHERE parent_id IS NULL AND request_timestamp < ?
+            AND status NOT IN ('pending', 'processing')
+            ORDER BY request_timestamp
             LIMIT ?
-        """, (limit,)).fetchall()
+        """, (older_than.isoformat(), limit)).fetchall()
+
+        if not parents:
+            return 0
+
+        placeholders = ", ".join("?" for _ in parents)
+        children = conn.execute(f"""
+            SELECT * FROM deletion_requests
+            WHERE parent_id IN ({placeholders})
+        """, [row["id"] for row in parents]).fetchall()
+        rows = children + parents
+
+        conn.executemany("""
+            INSERT INTO deletion_requests_archive (
+                id,
+                request_timestamp,
+                action_timestamp,
+                message_ts,
+                channel_id,
+                message_author_id,
+                requester_id,
+                admin_id,
+                status,
+                request_type,
+                parent_id,
+                message_hash,
+                archived_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+        """, [
+            (
+                row["id"],
+                row["request_timestamp"],
+                row["action_timestamp"],
+                row["message_ts"],
+                row["channel_id"],
+                row["message_author_id"],
+                row["requester_id"],
+                row["admin_id"],
+                row["status"],
+                row["request_type"],
+                row["parent_id"],
+                row["message_hash"] or _hash_text(row["message_text"]),
+                datetime.utcnow().isoformat()
+            )
+            for row in rows
+        ])
+
+        request_ids = [(row["id"],) for row in rows]
+        conn.executemany("DELETE FROM deletion_jobs WHERE request_id = ?", request_ids)
+        conn.executemany("DELETE FROM purge_jobs WHERE request_id = ?", request_ids)
+        conn.executemany("DELETE FROM deletion_request_files WHERE request_id = ?", request_ids)
+        conn.executemany("DELETE FROM deletion_requests WHERE id = ?", request_ids)
+
+    _notify_change()
+    return len(parents)
+
+def incremental_vacuum_enabled() -> bool:
+    with get_db("incremental_vacuum_enabled") as conn:
+        return _backend.incremental_vacuum_enabled(conn)
+
+def enable_incremental_vacuum():
+    with get_db("enable_incremental_vacuum") as conn:
+        if _backend.enable_incremental_vacuum(conn):
+            logger.info("Converted database to incremental auto-vacuum")
+
+def compact_db(max_pages: int):
+    with get_db("compact_db") as conn:
+        _backend.compact(conn, max_pages)
 
-        return [dict(row) for row in rows]
\ No newline at end of file
+def acquire_lease(name: str, holder: str, ttl_seconds: float) -> bool:
+    now = datetime.utcnow()
+    with get_db("acquire_lease") as conn:
+        row = conn.execute("""
+            INSERT INTO leases (name, holder, expires_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE
+            SET holder = excluded.holder,
+                expires_at = excluded.expires_at
+            WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+            RETURNING holder
+        """, (name, holder, (now + timedelta(seconds=ttl_seconds)).isoformat(), now.isoformat())).fetchone()
+
+        return row is not None
+
+def release_lease(name: str, holder: str):
+    with get_db("release_lease") as conn:
+        conn.execute("""
+            DELETE FROM leases
+            WHERE name = ? AND holder = ?
+        """, (name, holder))
+
+def is_delivery_recorded(delivery_key: str) -> bool:
+    with get_db("is_delivery_recorded") as conn:
+        row = conn.execute("""
+            SELECT 1 FROM processed_deliveries
+            WHERE delivery_key = ? AND expires_at >= ?
+        """, (delivery_key, datetime.utcnow().isoformat())).fetchone()
+
+        return row is not None
+
+def record_delivery(delivery_key: str, ttl_seconds: float):
+    expires_at = (datetime.utcnow() + timedelta(seconds=ttl_seconds)).isoformat()
+    with get_db("record_delivery") as conn:
+        conn.execute("""
+            INSERT INTO processed_deliveries (delivery_key, expires_at)
+            VALUES (?, ?)
+            ON CONFLICT (delivery_key) DO UPDATE
+            SET expires_at = excluded.expires_at
+        """, (delivery_key, expires_at))
+
+def prune_deliveries() -> int:
+    with get_db("prune_deliveries") as conn:
+        return conn.execute("""
+            DELETE FROM processed_deliveries
+            WHERE expires_at < ?
+        """, (datetime.utcnow().isoformat(),)).rowcount
+
+def get_slack_metadata(kind: str, object_id: str, max_age_seconds: int) -> Optional[str]:
+    oldest = (datetime.utcnow() - timedelta(seconds=max_age_seconds)).isoformat()
+    with get_db("get_slack_metadata") as conn:
+        row = conn.execute("""
+            SELECT name FROM slack_metadata
+            WHERE kind = ? AND object_id = ? AND updated_at >= ?
+        """, (kind, object_id, oldest)).fetchone()
+
+        if row:
+            return row["name"]
+        return None
+
+def set_slack_metadata(kind: str, object_id: str, name: str):
+    with get_db("set_slack_metadata") as conn:
+        conn.execute("""
+            INSERT INTO slack_metadata (kind, object_id, name, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (kind, object_id) DO UPDATE
+            SET name = excluded.name,
+                updated_at = excluded.updated_at
+        """, (kind, object_id, name, datetime.utcnow().isoformat()))
+
+def delete_slack_metadata(kind: str, object_id: str):
+    with get_db("delete_slack_metadata") as conn:
+        conn.execute("""
+            DELETE FROM slack_metadata
+            WHERE kind = ? AND object_id = ?
+        """, (kind, object_id))
\ No newline at end of file
@@ -0,0 +1,50 @@
+import logging
+import threading
+from typing import Dict
+
+import cache
+import database
+
+logger = logging.getLogger(__name__)
+
+class DeliveryDeduplicator:
+    def __init__(self, max_size: int, ttl_seconds: float, persist: bool):
+        self._seen = cache.TTLCache(max_size, ttl_seconds)
+        self._ttl = ttl_seconds
+        self._persist = persist
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "retries": 0}
+
+    def claim(self, key: str, retry: bool = False) -> bool:
+        with self._lock:
+            if retry:
+                self._stats["retries"] += 1
+            if key in self._seen:
+                self._stats["hits"] += 1
+                return False
+            self._seen.set(key, True)
+
+        claimed = True
+        if self._persist:
+            try:
+                claimed = not database.is_delivery_recorded(key)
+            except Exception as e:
+                logger.error(f"Error checking delivery {key}, processing it anyway: {e}")
+
+        with self._lock:
+            self._stats["misses" if claimed else "hits"] += 1
+        return claimed
+
+    def complete(self, key: str):
+        if self._persist:
+            try:
+                database.record_delivery(key, self._ttl)
+            except Exception as e:
+                logger.error(f"Error recording delivery {key}: {e}")
+
+    def release(self, key: str):
+        self._seen.pop(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, size=len(self._seen))
\ No newline at end of file
@@ -0,0 +1,90 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+from datetime import date
+from typing import BinaryIO, Optional
+
+import config
+import database
+
+FORMATS = ("csv", "jsonl")
+
+FIELDS = [
+    "id",
+    "request_timestamp",
+    "message_ts",
+    "channel_id",
+    "channel_name",
+    "message_author_id",
+    "message_author_name",
+    "message_text",
+    "requester_id",
+    "requester_name",
+    "status",
+    "admin_id",
+    "admin_name",
+    "action_timestamp",
+    "admin_message_ts",
+    "notes",
+    "parent_id",
+    "request_type",
+]
+
+def parse_date(value: str) -> str:
+    return date.fromisoformat(value).isoformat()
+
+def write_export(
+    output: BinaryIO,
+    fmt: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    status: Optional[str] = None
+) -> int:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    count = 0
+    with gzip.GzipFile(fileobj=output, mode="wb") as compressed:
+        text = io.TextIOWrapper(compressed, encoding="utf-8", newline="")
+        writer = csv.DictWriter(text, fieldnames=FIELDS, extrasaction="ignore") if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+
+        for row in database.iter_requests(since=since, until=until, status=status, batch_size=config.EXPORT_BATCH_SIZE):
+            if writer:
+                writer.writerow(row)
+            else:
+                text.write(json.dumps({field: row.get(field) for field in FIELDS}) + "\n")
+            count += 1
+
+        text.flush()
+        text.detach()
+
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the deletion request audit trail as gzip CSV or JSONL")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--since", type=parse_date, help="Include requests made on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=parse_date, help="Include requests made before this date (YYYY-MM-DD)")
+    parser.add_argument("--status", help="Only include requests with this status")
+    parser.add_argument("--output", "-o", help="Output file (defaults to stdout)")
+    args = parser.parse_args()
+
+    database.init_db()
+    try:
+        if args.output:
+            with open(args.output, "wb") as output:
+                count = write_export(output, args.format, args.since, args.until, args.status)
+        else:
+            count = write_export(sys.stdout.buffer, args.format, args.since, args.until, args.status)
+    finally:
+        database.close_db()
+
+    print(f"Exported {count} deletion requests", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import cache
+import config
+import database
+
+logger = logging.getLogger(__name__)
+
+STATUS_EMOJI = {
+    "pending": "⏳",
+    "processing": "⚙️",
+    "approved": "✅",
+    "denied": "❌",
+    "error": "⚠️",
+}
+
+_state = cache.TTLCache(config.HOME_CACHE_SIZE, config.HOME_PUBLISHED_HASH_SECONDS)
+_state_lock = threading.Lock()
+_render_cache = cache.TTLCache(config.HOME_CACHE_SIZE, config.HOME_CACHE_SECONDS)
+_published = cache.TTLCache(config.HOME_CACHE_SIZE, config.HOME_CACHE_SECONDS)
+_published_hashes = cache.TTLCache(config.HOME_CACHE_SIZE, config.HOME_PUBLISHED_HASH_SECONDS)
+_refresh_lock = threading.Lock()
+_refresh_timer: Optional[threading.Timer] = None
+
+def _load_state(user_id: str) -> Dict[str, Any]:
+    state = _state.get(user_id)
+    if state is None:
+        state = {
+            "status": None,
+            "channel_id": None,
+            "author_id": None,
+            "cursor": None,
+            "history": [],
+        }
+    _state.set(user_id, state)
+    return state
+
+def _get_state(user_id: str) -> Dict[str, Any]:
+    with _state_lock:
+        return dict(_load_state(user_id))
+
+def _update_state(user_id: str, **changes: Any):
+    with _state_lock:
+        _load_state(user_id).update(changes)
+
+def set_filter(user_id: str, name: str, value: Optional[str]):
+    _update_state(user_id, **{name: value or None, "cursor": None, "history": []})
+
+def clear_filters(user_id: str):
+    _update_state(user_id, status=None, channel_id=None, author_id=None, cursor=None, history=[])
+
+def next_page(user_id: str, cursor: str):
+    state = _get_state(user_id)
+    _update_state(user_id, cursor=cursor, history=state["history"] + [state["cursor"]])
+
+def previous_page(user_id: str):
+    state = _get_state(user_id)
+    history = state["history"]
+    _update_state(user_id, cursor=history[-1] if history else None, history=history[:-1])
+
+def first_page(user_id: str):
+    _update_state(user_id, cursor=None, history=[])
+
+def _state_key(user_id: str, is_admin: bool) -> tuple:
+    state = _get_state(user_id)
+    return (user_id, is_admin, state["status"], state["channel_id"], state["author_id"], state["cursor"])
+
+def publish(client, user_id: str, is_admin: bool) -> bool:
+    key = _state_key(user_id, is_admin)
+    view = _render_cache.get(key)
+
+    if view is not None and _published.get(user_id) == key:
+        return False
+
+    if view is None:
+        view = build_view(user_id, is_admin)
+        _render_cache.set(key, view)
+
+    _published.set(user_id, key)
+
+    view_hash = hashlib.sha256(json.dumps(view, sort_keys=True).encode()).hexdigest()
+    if _published_hashes.get(user_id) == view_hash:
+        return False
+
+    client.views_publish(user_id=user_id, view=view)
+    _published_hashes.set(user_id, view_hash)
+    return True
+
+def schedule_refresh(client):
+    global _refresh_timer
+    with _refresh_lock:
+        if _refresh_timer is not None:
+            return
+        _refresh_timer = threading.Timer(config.HOME_REFRESH_DEBOUNCE_SECONDS, _refresh_admins, args=(client,))
+        _refresh_timer.daemon = True
+        _refresh_timer.start()
+
+def _refresh_admins(client):
+    global _refresh_timer
+    with _refresh_lock:
+        _refresh_timer = None
+
+    _render_cache.clear()
+    _published.clear()
+
+    for user_id in _published_hashes.keys():
+        if not config.is_listed_admin(user_id):
+            continue
+        try:
+            publish(client, user_id, True)
+        except Exception as e:
+            logger.error(f"Error refreshing Home tab for {user_id}: {e}")
+
+def _format_time(request_timestamp: str) -> str:
+    epoch = int(datetime.fromisoformat(request_timestamp).replace(tzinfo=timezone.utc).timestamp())
+    return f"<!date^{epoch}^{{date_short_pretty}} {{time}}|{request_timestamp}>"
+
+def _request_block(request: Dict[str, Any]) -> Dict[str, Any]:
+    text = request["message_text"] or ("[Redacted]" if request.get("message_hash") else "[No text content]")
+    preview = text[:100] + ("..." if len(text) > 100 else "")
+    status = request["status"]
+
+    return {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": (
+                f"{STATUS_EMOJI.get(status, '•')} *{status.capitalize()}* • <@{request['message_author_id']}> in "
+                f"<#{request['channel_id']}> • {_format_time(request['request_timestamp'])}\n> {preview}"
+            )
+        }
+    }
+
+def _filter_blocks(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    status_options = [
+        {"text": {"type": "plain_text", "text": "All statuses"}, "value": "all"}
+    ] + [
+        {"text": {"type": "plain_text", "text": f"{emoji} {status.capitalize()}"}, "value": status}
+        for status, emoji in STATUS_EMOJI.items()
+    ]
+
+    status_select = {
+        "type": "static_select",
+        "action_id": "home_filter_status",
+        "placeholder": {"type": "plain_text", "text": "Status"},
+        "options": status_options,
+    }
+    if state["status"]:
+        status_select["initial_option"] = next(option for option in status_options if option["value"] == state["status"])
+
+    channel_select = {
+        "type": "conversations_select",
+        "action_id": "home_filter_channel",
+        "placeholder": {"type": "plain_text", "text": "Any channel"},
+    }
+    if state["channel_id"]:
+        channel_select["initial_conversation"] = state["channel_id"]
+
+    author_select = {
+        "type": "users_select",
+        "action_id": "home_filter_author",
+        "placeholder": {"type": "plain_text", "text": "Any author"},
+    }
+    if state["author_id"]:
+        author_select["initial_user"] = state["author_id"]
+
+    elements = [status_select, channel_select, author_select]
+    if state["status"] or state["channel_id"] or state["author_id"]:
+        elements.append({
+            "type": "button",
+            "action_id": "home_clear_filters",
+            "text": {"type": "plain_text", "text": "Clear filters"},
+        })
+
+    return [{"type": "actions", "block_id": "home_filters", "elements": elements}]
+
+def _dashboard_blocks(user_id: str) -> List[Dict[str, Any]]:
+    state = _get_state(user_id)
+    before = None
+    if state["cursor"]:
+        request_timestamp, request_id = state["cursor"].rsplit("|", 1)
+        before = (request_timestamp, int(request_id))
+
+    requests = database.get_recent_requests(
+        limit=config.HOME_PAGE_SIZE + 1,
+        before=before,
+        status=state["status"],
+        channel_id=state["channel_id"],
+        author_id=state["author_id"],
+        include_children=False
+    )
+    has_more = len(requests) > config.HOME_PAGE_SIZE
+    requests = requests[:config.HOME_PAGE_SIZE]
+
+    blocks = [
+        {"type": "divider"},
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": "Deletion Requests"}
+        },
+    ] + _filter_blocks(state)
+
+    if requests:
+        blocks.extend(_request_block(request) for request in requests)
+    else:
+        blocks.append({
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "_No deletion requests match these filters._"}
+        })
+
+    navigation = []
+    if state["cursor"]:
+        navigation.append({
+            "type": "button",
+            "action_id": "home_first_page",
+            "text": {"type": "plain_text", "text": "⏮ Newest"},
+        })
+        navigation.append({
+            "type": "button",
+            "action_id": "home_previous_page",
+            "text": {"type": "plain_text", "text": "◀ Previous"},
+        })
+    if has_more:
+        last = requests[-1]
+        navigation.append({
+            "type": "button",
+            "action_id": "home_next_page",
+            "text": {"type": "plain_text", "text": "Next ▶"},
+            "value": f"{last['request_timestamp']}|{last['id']}",
+        })
+    if navigation:
+        blocks.append({"type": "actions", "block_id": "home_navigation", "elements": navigation})
+
+    return blocks
+
+def build_view(user_id: str, is_admin: bool) -> Dict[str, Any]:
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": "🗑️ Message Deletion App"
+            }
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "This app allows you to request deletion of your own messages with admin approval."
+            }
+        },
+        {
+            "type": "divider"
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "*How to use:*\n1. Right-click on any message you've posted\n2. Select 'Delete my message' from the shortcuts menu\n3. Wait for admin approval"
+            }
+        }
+    ]
+
+    if is_admin:
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Admin Status:* ✅ You are an admin\n\nReview requests in <#{config.ADMIN_REVIEW_CHANNEL}>"
+            }
+        })
+        blocks.extend(_dashboard_blocks(user_id))
+
+    return {
+        "type": "home",
+        "blocks": blocks
+    }
@@ -0,0 +1,57 @@
+import logging
+from typing import Any, Dict, Optional
+
+import config
+import metadata
+import workers
+
+logger = logging.getLogger(__name__)
+
+bot: Dict[str, Any] = {}
+user: Dict[str, Any] = {}
+admin_channel_name: Optional[str] = None
+
+def _auth_test(client, name: str) -> Dict[str, Any]:
+    try:
+        response = client.auth_test()
+    except Exception as e:
+        raise ValueError(f"{name} is not valid: {e}") from e
+    return dict(response.data)
+
+def bootstrap(bot_client, user_client):
+    global admin_channel_name
+
+    bot_identity, user_identity = workers.gather(
+        lambda: _auth_test(bot_client, "SLACK_BOT_TOKEN"),
+        lambda: _auth_test(user_client, "SLACK_USER_TOKEN")
+    )
+    for result in (bot_identity, user_identity):
+        if isinstance(result, Exception):
+            raise result
+
+    if bot_identity.get("team_id") != user_identity.get("team_id"):
+        raise ValueError("SLACK_BOT_TOKEN and SLACK_USER_TOKEN belong to different workspaces")
+
+    bot.clear()
+    bot.update(bot_identity)
+    user.clear()
+    user.update(user_identity)
+
+    admin_ids = sorted(user_id for user_id in config.ADMIN_USER_IDS if user_id)
+    channel_name, *admin_names = workers.gather(
+        lambda: metadata.get_channel_name(bot_client, config.ADMIN_REVIEW_CHANNEL),
+        *[(lambda user_id=user_id: metadata.get_user_name(bot_client, user_id)) for user_id in admin_ids]
+    )
+
+    if isinstance(channel_name, Exception):
+        raise ValueError(f"ADMIN_REVIEW_CHANNEL {config.ADMIN_REVIEW_CHANNEL} is not accessible to the bot: {channel_name}")
+    admin_channel_name = channel_name
+
+    for user_id, name in zip(admin_ids, admin_names):
+        if isinstance(name, Exception):
+            logger.warning(f"Could not look up admin {user_id}: {name}")
+
+    logger.info(
+        f"Running as @{bot['user']} in {bot.get('team')}, deleting as @{user['user']}, "
+        f"reviewing in #{admin_channel_name} with {len(admin_ids)} admin(s)"
+    )
@@ -0,0 +1,91 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+import config
+import database
+import workers
+
+logger = logging.getLogger(__name__)
+
+class PermanentJobError(Exception):
+    pass
+
+class DeletionWorker:
+    def __init__(
+        self,
+        run: Callable[[Dict[str, Any]], None],
+        on_failure: Callable[[Dict[str, Any], str], None]
+    ):
+        self._run = run
+        self._on_failure = on_failure
+        self._executor = ThreadPoolExecutor(max_workers=config.DELETION_JOB_CONCURRENCY, thread_name_prefix="deletion-jobs")
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="deletion-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self):
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                jobs = database.claim_deletion_jobs(config.DELETION_JOB_CONCURRENCY)
+            except Exception as e:
+                logger.error(f"Error claiming deletion jobs: {e}")
+                jobs = []
+
+            if jobs:
+                workers.gather(*[lambda job=job: self._execute(job) for job in jobs], executor=self._executor)
+                continue
+
+            self._wake.wait(self._seconds_until_next_job())
+
+    def _seconds_until_next_job(self) -> float:
+        try:
+            next_run_at = database.get_next_deletion_job_time()
+        except Exception as e:
+            logger.error(f"Error reading next deletion job: {e}")
+            return config.DELETION_JOB_POLL_SECONDS
+
+        if next_run_at is None:
+            return config.DELETION_JOB_POLL_SECONDS
+        delay = (next_run_at - datetime.utcnow()).total_seconds()
+        return min(max(delay, 0), config.DELETION_JOB_POLL_SECONDS)
+
+    def _execute(self, job: Dict[str, Any]):
+        try:
+            self._run(job)
+            return
+        except PermanentJobError as e:
+            error_msg = str(e)
+        except Exception as e:
+            if job["attempts"] < config.DELETION_JOB_MAX_ATTEMPTS:
+                delay = min(
+                    config.DELETION_JOB_MAX_BACKOFF_SECONDS,
+                    config.DELETION_JOB_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1)
+                )
+                logger.warning(f"Deletion job {job['id']} failed (attempt {job['attempts']}), retrying in {delay}s: {e}")
+                database.retry_deletion_job(job["id"], str(e), datetime.utcnow() + timedelta(seconds=delay))
+                return
+            error_msg = f"Error: {e}"
+
+        logger.error(f"Deletion job {job['id']} failed permanently: {error_msg}")
+        database.complete_deletion_job(job["id"], job["request_id"], "error", notes=error_msg)
+        try:
+            self._on_failure(job, error_msg)
+        except Exception as e:
+            logger.error(f"Error reporting failed deletion job {job['id']}: {e}")
@@ -0,0 +1,89 @@
+import logging
+import threading
+from typing import Callable, List, Optional
+
+import config
+import database
+
+logger = logging.getLogger(__name__)
+
+class LeaderElector:
+    def __init__(self, name: str, services: List, maintenance: Optional[Callable[[], None]] = None):
+        self._name = name
+        self._services = [service for service in services if service]
+        self._maintenance = maintenance
+        self._holder = config.INSTANCE_ID if config.MULTI_WORKER else "standalone"
+        self._ttl = config.LEADER_LEASE_SECONDS
+        self._leading = False
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leading
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="leader-election", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._leading:
+            self._demote()
+            try:
+                database.release_lease(self._name, self._holder)
+            except Exception as e:
+                logger.error(f"Error releasing {self._name} lease: {e}")
+
+    def _promote(self):
+        started = []
+        try:
+            for service in self._services:
+                service.start()
+                started.append(service)
+        except Exception as e:
+            logger.error(f"Error starting {self._name} services, retrying on the next renewal: {e}")
+            self._stop_services(started)
+            try:
+                database.release_lease(self._name, self._holder)
+            except Exception as e:
+                logger.error(f"Error releasing {self._name} lease: {e}")
+            return
+
+        self._leading = True
+        logger.info(f"{self._holder} is now the {self._name} leader")
+
+    def _demote(self):
+        logger.info(f"{self._holder} is no longer the {self._name} leader")
+        self._leading = False
+        self._stop_services(self._services)
+
+    def _stop_services(self, services: List):
+        for service in reversed(services):
+            try:
+                service.stop()
+            except Exception as e:
+                logger.error(f"Error stopping {self._name} service {type(service).__name__}: {e}")
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            try:
+                leading = database.acquire_lease(self._name, self._holder, self._ttl)
+            except Exception as e:
+                logger.error(f"Error renewing {self._name} lease: {e}")
+                leading = False
+
+            if leading and not self._leading:
+                self._promote()
+            elif not leading and self._leading:
+                self._demote()
+
+            if self._leading and self._maintenance:
+                try:
+                    self._maintenance()
+                except Exception as e:
+                    logger.error(f"Error running {self._name} maintenance: {e}")
+
+            self._stopping.wait(self._ttl / 3)
\ No newline at end of file
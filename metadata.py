@@ -0,0 +1,65 @@
+import logging
+
+import cache
+import config
+import database
+
+logger = logging.getLogger(__name__)
+
+_users = cache.TTLCache(config.METADATA_CACHE_SIZE, config.METADATA_CACHE_TTL_SECONDS)
+_channels = cache.TTLCache(config.METADATA_CACHE_SIZE, config.METADATA_CACHE_TTL_SECONDS)
+
+def _lookup(kind: str, entries: cache.TTLCache, object_id: str, fetch) -> str:
+    name = entries.get(object_id)
+    if name is not None:
+        return name
+
+    if config.METADATA_CACHE_PERSIST:
+        try:
+            name = database.get_slack_metadata(kind, object_id, config.METADATA_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Could not read cached {kind} {object_id}: {e}")
+        if name is not None:
+            entries.set(object_id, name)
+            return name
+
+    name = fetch()
+    _remember(kind, entries, object_id, name)
+    return name
+
+def _remember(kind: str, entries: cache.TTLCache, object_id: str, name: str):
+    entries.set(object_id, name)
+    if config.METADATA_CACHE_PERSIST:
+        try:
+            database.set_slack_metadata(kind, object_id, name)
+        except Exception as e:
+            logger.warning(f"Could not persist {kind} {object_id}: {e}")
+
+def _forget(kind: str, entries: cache.TTLCache, object_id: str):
+    entries.pop(object_id)
+    if config.METADATA_CACHE_PERSIST:
+        try:
+            database.delete_slack_metadata(kind, object_id)
+        except Exception as e:
+            logger.warning(f"Could not forget {kind} {object_id}: {e}")
+
+def get_user_name(client, user_id: str) -> str:
+    return _lookup("user", _users, user_id, lambda: client.users_info(user=user_id)["user"]["real_name"])
+
+def get_channel_name(client, channel_id: str) -> str:
+    return _lookup("channel", _channels, channel_id, lambda: client.conversations_info(channel=channel_id)["channel"]["name"])
+
+def update_user(user: dict):
+    real_name = user.get("real_name") or user.get("profile", {}).get("real_name")
+    if real_name == _users.get(user["id"]):
+        return
+    if real_name:
+        _remember("user", _users, user["id"], real_name)
+    else:
+        _forget("user", _users, user["id"])
+
+def update_channel(channel: dict):
+    if channel.get("name"):
+        _remember("channel", _channels, channel["id"], channel["name"])
+    else:
+        _forget("channel", _channels, channel["id"])
@@ -0,0 +1,43 @@
+import logging
+import threading
+
+import database
+import schema
+
+logger = logging.getLogger(__name__)
+
+BATCH_PAUSE_SECONDS = 0.05
+
+class MigrationWorker:
+    def __init__(self):
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="migrations", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        try:
+            applied = database.get_applied_migrations()
+        except Exception as e:
+            logger.error(f"Error reading schema version: {e}")
+            return
+
+        for migration in schema.MIGRATIONS:
+            if self._stopping.is_set():
+                return
+            if not migration.background or migration.version in applied:
+                continue
+
+            logger.info(f"Running background schema migration {migration.version} ({migration.name})")
+            try:
+                database.apply_migration(migration, lambda: not self._stopping.wait(BATCH_PAUSE_SECONDS))
+            except Exception as e:
+                logger.error(f"Background schema migration {migration.version} ({migration.name}) failed, retrying on next start: {e}")
\ No newline at end of file
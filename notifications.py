@@ -0,0 +1,155 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_DIGEST_CHARS = 3500
+MAX_SEND_ATTEMPTS = 3
+
+entries_buffered = metrics.Counter(
+    "slack_cleaner_notification_entries_total",
+    "Audit log entries and requester notifications queued for delivery"
+)
+messages_sent = metrics.Counter(
+    "slack_cleaner_notification_messages_total",
+    "Messages posted to deliver queued notifications",
+    ["result"]
+)
+
+class _Buffer:
+    def __init__(self, heading: str):
+        self.heading = heading
+        self.entries: List[str] = []
+        self.first_added_at = time.monotonic()
+        self.attempts = 0
+
+class NotificationCoalescer:
+    def __init__(self, client, window_seconds: float, max_entries: int):
+        self._client = client
+        self._window = window_seconds
+        self._max_entries = max(1, max_entries)
+        self._buffers: Dict[str, _Buffer] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._window > 0
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="notifications", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.flush()
+
+    def post(self, channel: str, text: str, heading: str):
+        entries_buffered.inc()
+        with self._lock:
+            buffering = self.enabled and self._thread is not None and not self._stopping.is_set()
+            if buffering:
+                buffer = self._buffers.get(channel)
+                first = buffer is None
+                if first:
+                    buffer = self._buffers[channel] = _Buffer(heading)
+                buffer.entries.append(text)
+                full = len(buffer.entries) >= self._max_entries
+
+        if not buffering:
+            self._send(channel, text)
+        elif first or full:
+            self._wake.set()
+
+    def flush(self, force: bool = True):
+        now = time.monotonic()
+        with self._lock:
+            due = {
+                channel: buffer for channel, buffer in self._buffers.items()
+                if force or len(buffer.entries) >= self._max_entries or now - buffer.first_added_at >= self._window
+            }
+            for channel in due:
+                del self._buffers[channel]
+
+        for channel, buffer in due.items():
+            failed: List[str] = []
+            for entries, text in self._digests(buffer):
+                try:
+                    self._send(channel, text)
+                except Exception as e:
+                    logger.error(f"Error sending notification digest to {channel}: {e}")
+                    failed.extend(entries)
+            if failed:
+                self._requeue(channel, buffer, failed)
+
+    def _requeue(self, channel: str, buffer: _Buffer, entries: List[str]):
+        attempts = buffer.attempts + 1
+        with self._lock:
+            retry = attempts < MAX_SEND_ATTEMPTS and self._thread is not None and not self._stopping.is_set()
+            if retry:
+                retried = _Buffer(buffer.heading)
+                retried.attempts = attempts
+                retried.entries = entries
+                pending = self._buffers.get(channel)
+                if pending:
+                    retried.entries += pending.entries
+                self._buffers[channel] = retried
+
+        if retry:
+            self._wake.set()
+        else:
+            logger.error(f"Dropping {len(entries)} notification(s) for {channel} after {attempts} attempt(s):\n" + "\n\n".join(entries))
+
+    def _digests(self, buffer: _Buffer) -> List[Tuple[List[str], str]]:
+        if len(buffer.entries) == 1:
+            return [(buffer.entries, buffer.entries[0])]
+
+        chunks: List[List[str]] = [[]]
+        size = 0
+        for entry in buffer.entries:
+            if chunks[-1] and (len(chunks[-1]) >= self._max_entries or size + len(entry) > MAX_DIGEST_CHARS):
+                chunks.append([])
+                size = 0
+            chunks[-1].append(entry)
+            size += len(entry) + 2
+
+        return [
+            (chunk, chunk[0] if len(chunk) == 1 else f"*{buffer.heading}* ({len(chunk)})\n\n" + "\n\n".join(chunk))
+            for chunk in chunks
+        ]
+
+    def _send(self, channel: str, text: str):
+        try:
+            self._client.chat_postMessage(channel=channel, text=text)
+        except Exception:
+            messages_sent.inc("error")
+            raise
+        messages_sent.inc("ok")
+
+    def _seconds_until_next_flush(self) -> float:
+        with self._lock:
+            if not self._buffers:
+                return self._window
+            oldest = min(buffer.first_added_at for buffer in self._buffers.values())
+        return max(0.0, oldest + self._window - time.monotonic())
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self._seconds_until_next_flush())
+            self._wake.clear()
+            try:
+                self.flush(force=False)
+            except Exception as e:
+                logger.error(f"Error flushing notifications: {e}")
\ No newline at end of file
@@ -0,0 +1,81 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+import config
+import database
+import jobs
+
+logger = logging.getLogger(__name__)
+
+class PurgeWorker:
+    def __init__(
+        self,
+        run: Callable[[Dict[str, Any], Callable[[], bool]], None],
+        on_failure: Callable[[Dict[str, Any], str], None]
+    ):
+        self._run = run
+        self._on_failure = on_failure
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="purge-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self):
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                job = database.get_next_purge_job()
+            except Exception as e:
+                logger.error(f"Error reading purge jobs: {e}")
+                job = None
+
+            if job is None:
+                self._wake.wait(config.DELETION_JOB_POLL_SECONDS)
+                continue
+
+            delay = (datetime.fromisoformat(job["next_run_at"]) - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                self._wake.wait(min(delay, config.DELETION_JOB_POLL_SECONDS))
+                continue
+
+            self._execute(job)
+
+    def _execute(self, job: Dict[str, Any]):
+        try:
+            self._run(job, self._stopping.is_set)
+            return
+        except jobs.PermanentJobError as e:
+            error_msg = str(e)
+        except Exception as e:
+            attempts = job["attempts"] + 1
+            if attempts < config.DELETION_JOB_MAX_ATTEMPTS:
+                delay = min(
+                    config.DELETION_JOB_MAX_BACKOFF_SECONDS,
+                    config.DELETION_JOB_BACKOFF_SECONDS * 2 ** (attempts - 1)
+                )
+                logger.warning(f"Purge job {job['id']} failed (attempt {attempts}), resuming in {delay}s: {e}")
+                database.retry_purge_job(job["id"], str(e), datetime.utcnow() + timedelta(seconds=delay))
+                return
+            error_msg = f"Error: {e}"
+
+        logger.error(f"Purge job {job['id']} failed permanently: {error_msg}")
+        database.complete_purge_job(job["id"], job["request_id"], "error", notes=error_msg)
+        try:
+            self._on_failure(job, error_msg)
+        except Exception as e:
+            logger.error(f"Error reporting failed purge job {job['id']}: {e}")
\ No newline at end of file
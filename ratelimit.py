@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+import config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+api_call_seconds = metrics.Histogram(
+    "slack_cleaner_slack_api_seconds",
+    "Latency of individual Slack Web API calls",
+    ["method"]
+)
+api_errors = metrics.Counter(
+    "slack_cleaner_slack_api_errors_total",
+    "Slack Web API calls that failed, by error code",
+    ["method", "error"]
+)
+
+TIER_1 = 1
+TIER_2 = 20
+TIER_3 = 50
+TIER_4 = 100
+SPECIAL_PER_CHANNEL = 60
+
+METHOD_RATES = {
+    "auth.test": TIER_4,
+    "chat.delete": TIER_3,
+    "chat.getPermalink": TIER_4,
+    "chat.postMessage": SPECIAL_PER_CHANNEL,
+    "chat.update": TIER_3,
+    "conversations.history": TIER_3,
+    "conversations.info": TIER_3,
+    "conversations.replies": TIER_3,
+    "files.completeUploadExternal": TIER_4,
+    "files.delete": TIER_3,
+    "files.getUploadURLExternal": TIER_4,
+    "reactions.add": TIER_3,
+    "users.info": TIER_4,
+    "views.publish": TIER_4,
+}
+
+PER_CHANNEL_METHODS = {"chat.postMessage"}
+
+IDEMPOTENT_METHODS = {
+    "auth.test",
+    "chat.delete",
+    "chat.getPermalink",
+    "chat.update",
+    "conversations.history",
+    "conversations.info",
+    "conversations.replies",
+    "files.delete",
+    "reactions.add",
+    "users.info",
+    "views.publish",
+}
+
+TRANSIENT_ERRORS = {"internal_error", "fatal_error", "service_unavailable", "request_timeout"}
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+class Scheduler:
+    def __init__(self):
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, api_method: str, channel: Optional[str]) -> TokenBucket:
+        key = (api_method, channel) if api_method in PER_CHANNEL_METHODS else api_method
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(METHOD_RATES.get(api_method, TIER_3))
+                self._buckets[key] = bucket
+            return bucket
+
+    def record(self, api_method: str, **values: float):
+        with self._lock:
+            stats = self._stats.setdefault(api_method, {
+                "calls": 0,
+                "retries": 0,
+                "ratelimited": 0,
+                "errors": 0,
+                "wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+            })
+            for key, value in values.items():
+                if key == "max_wait_seconds":
+                    stats[key] = max(stats[key], value)
+                else:
+                    stats[key] += value
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {method: dict(values) for method, values in self._stats.items()}
+
+scheduler = Scheduler()
+
+def _channel_of(kwargs: Dict[str, Any]) -> Optional[str]:
+    for key in ("json", "data", "params"):
+        payload = kwargs.get(key)
+        if isinstance(payload, dict) and payload.get("channel"):
+            return payload["channel"]
+    return None
+
+def _retry_after(e: SlackApiError) -> float:
+    headers = getattr(e.response, "headers", None) or {}
+    for key, value in headers.items():
+        if key.lower() == "retry-after":
+            value = value[0] if isinstance(value, list) else value
+            try:
+                return max(1.0, float(value))
+            except ValueError:
+                break
+    return 1.0
+
+SCHEDULER_METRICS = (
+    ("slack_cleaner_slack_api_calls_total", "calls", "Slack Web API call attempts made through the scheduler"),
+    ("slack_cleaner_slack_api_retries_total", "retries", "Slack Web API calls retried after a rate limit or transient error"),
+    ("slack_cleaner_slack_api_ratelimited_total", "ratelimited", "Slack Web API calls rejected with HTTP 429"),
+    ("slack_cleaner_slack_api_rate_limit_wait_seconds_total", "wait_seconds", "Time spent waiting for a rate limit token"),
+)
+
+def _collect_scheduler_stats():
+    stats = scheduler.stats()
+    for name, key, documentation in SCHEDULER_METRICS:
+        yield name, "counter", documentation, [({"method": method}, values[key]) for method, values in stats.items()]
+
+metrics.register_collector(_collect_scheduler_stats)
+
+class ScheduledWebClient(WebClient):
+    def _timed_call(self, api_method: str, kwargs: Dict[str, Any]):
+        started_at = time.perf_counter()
+        try:
+            return super().api_call(api_method, **kwargs)
+        except SlackApiError as e:
+            api_errors.inc(api_method, (e.response.get("error") if e.response is not None else None) or "unknown")
+            raise
+        except Exception as e:
+            api_errors.inc(api_method, type(e).__name__)
+            raise
+        finally:
+            api_call_seconds.observe(time.perf_counter() - started_at, api_method)
+
+    def api_call(self, api_method: str, **kwargs):
+        if not config.RATE_LIMIT_ENABLED:
+            return self._timed_call(api_method, kwargs)
+
+        bucket = scheduler.bucket(api_method, _channel_of(kwargs))
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            scheduler.record(api_method, calls=1, wait_seconds=waited, max_wait_seconds=waited)
+            if waited >= 1:
+                logger.info(f"Waited {waited:.1f}s for {api_method} rate limit")
+
+            try:
+                return self._timed_call(api_method, kwargs)
+            except SlackApiError as e:
+                status_code = getattr(e.response, "status_code", None)
+                error = e.response.get("error") if e.response is not None else None
+
+                if status_code == 429 or error == "ratelimited":
+                    retry_after = _retry_after(e)
+                    bucket.block_for(retry_after)
+                    scheduler.record(api_method, ratelimited=1)
+                    logger.warning(f"{api_method} rate limited, retrying in {retry_after:.0f}s")
+                elif api_method in IDEMPOTENT_METHODS and (error in TRANSIENT_ERRORS or (status_code or 0) >= 500):
+                    time.sleep(min(30, 2 ** attempt))
+                else:
+                    scheduler.record(api_method, errors=1)
+                    raise
+
+                attempt += 1
+                if attempt > config.RATE_LIMIT_MAX_RETRIES:
+                    scheduler.record(api_method, errors=1)
+                    raise
+                scheduler.record(api_method, retries=1)
@@ -0,0 +1,81 @@
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta
+
+import config
+import database
+
+logger = logging.getLogger(__name__)
+
+BATCH_PAUSE_SECONDS = 0.05
+
+class RetentionWorker:
+    def __init__(self, retention_days: int, mode: str):
+        self._retention = timedelta(days=retention_days)
+        self._step = database.archive_requests if mode == "archive" else database.redact_requests
+        self._mode = mode
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="retention", daemon=True)
+        self._thread.start()
+        logger.info(f"Retention enabled: requests older than {self._retention.days} days are {self._mode}d")
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_once(self) -> int:
+        cutoff = datetime.utcnow() - self._retention
+        processed = 0
+        while not self._stopping.is_set():
+            count = self._step(cutoff, config.RETENTION_BATCH_SIZE)
+            processed += count
+            if count < config.RETENTION_BATCH_SIZE:
+                break
+            self._stopping.wait(BATCH_PAUSE_SECONDS)
+
+        database.compact_db(config.RETENTION_VACUUM_PAGES)
+        return processed
+
+    def _loop(self):
+        try:
+            if not database.incremental_vacuum_enabled():
+                logger.warning("Database is not in incremental auto-vacuum mode, so retention cannot return freed space to disk; stop the app and run `python retention.py --enable-incremental-vacuum` once")
+        except Exception as e:
+            logger.error(f"Error reading auto-vacuum mode: {e}")
+
+        while not self._stopping.is_set():
+            try:
+                processed = self.run_once()
+                if processed:
+                    logger.info(f"Retention {self._mode}d {processed} deletion requests")
+            except Exception as e:
+                logger.error(f"Error applying retention: {e}")
+
+            self._stopping.wait(config.RETENTION_INTERVAL_HOURS * 3600)
+
+def main():
+    parser = argparse.ArgumentParser(description="Database maintenance for retention")
+    parser.add_argument(
+        "--enable-incremental-vacuum",
+        action="store_true",
+        help="Convert an existing SQLite database to incremental auto-vacuum with a one-off full VACUUM (stop the app first)"
+    )
+    args = parser.parse_args()
+    if not args.enable_incremental_vacuum:
+        parser.error("nothing to do; pass --enable-incremental-vacuum")
+
+    logging.basicConfig(level=logging.INFO)
+    database.init_db()
+    try:
+        database.enable_incremental_vacuum()
+    finally:
+        database.close_db()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
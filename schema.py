@@ -0,0 +1,208 @@
+from typing import Any, Callable, Optional, Sequence, Union
+
+Step = Union[str, Callable[[Any, Any], None]]
+
+class Migration:
+    def __init__(
+        self,
+        version: int,
+        name: str,
+        steps: Sequence[Step] = (),
+        background: bool = False,
+        backfill: Optional[Callable[[Any, int], int]] = None
+    ):
+        self.version = version
+        self.name = name
+        self.steps = list(steps)
+        self.background = background
+        self.backfill = backfill
+
+def _add_request_columns(conn, backend):
+    columns = backend.columns(conn, "deletion_requests")
+    if "parent_id" not in columns:
+        conn.execute("ALTER TABLE deletion_requests ADD COLUMN parent_id INTEGER REFERENCES deletion_requests(id)")
+
+    if "request_type" not in columns:
+        conn.execute("ALTER TABLE deletion_requests ADD COLUMN request_type TEXT NOT NULL DEFAULT 'message'")
+
+    if "message_hash" not in columns:
+        conn.execute("ALTER TABLE deletion_requests ADD COLUMN message_hash TEXT")
+
+def _close_duplicate_open_requests(conn, backend):
+    conn.execute("""
+        UPDATE deletion_requests
+        SET status = 'error', notes = 'Closed as a duplicate of an earlier open request'
+        WHERE status IN ('pending', 'processing')
+        AND request_type IN ('message', 'thread_replies')
+        AND EXISTS (
+            SELECT 1 FROM deletion_requests earlier
+            WHERE earlier.id < deletion_requests.id
+            AND earlier.status IN ('pending', 'processing')
+            AND earlier.request_type = deletion_requests.request_type
+            AND earlier.channel_id = deletion_requests.channel_id
+            AND earlier.message_ts = deletion_requests.message_ts
+            AND (earlier.request_type = 'message' OR earlier.requester_id = deletion_requests.requester_id)
+        )
+    """)
+
+MIGRATIONS = [
+    Migration(1, "baseline", [
+        """
+        CREATE TABLE IF NOT EXISTS deletion_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_timestamp TEXT NOT NULL,
+            message_ts TEXT NOT NULL,
+            channel_id TEXT NOT NULL,
+            channel_name TEXT,
+            message_author_id TEXT NOT NULL,
+            message_author_name TEXT,
+            message_text TEXT NOT NULL,
+            requester_id TEXT NOT NULL,
+            requester_name TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            admin_id TEXT,
+            admin_name TEXT,
+            action_timestamp TEXT,
+            admin_message_ts TEXT,
+            notes TEXT,
+            parent_id INTEGER REFERENCES deletion_requests(id),
+            request_type TEXT NOT NULL DEFAULT 'message',
+            message_hash TEXT
+        )
+        """,
+        _add_request_columns,
+        """
+        CREATE TABLE IF NOT EXISTS deletion_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_id INTEGER NOT NULL UNIQUE REFERENCES deletion_requests(id),
+            state TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_run_at TEXT NOT NULL,
+            admin_id TEXT NOT NULL,
+            admin_name TEXT,
+            payload TEXT,
+            message_deleted INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_deletion_jobs_due
+        ON deletion_jobs(state, next_run_at)
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS deletion_requests_archive (
+            id INTEGER PRIMARY KEY,
+            request_timestamp TEXT NOT NULL,
+            action_timestamp TEXT,
+            message_ts TEXT NOT NULL,
+            channel_id TEXT NOT NULL,
+            message_author_id TEXT NOT NULL,
+            requester_id TEXT NOT NULL,
+            admin_id TEXT,
+            status TEXT NOT NULL,
+            request_type TEXT NOT NULL,
+            parent_id INTEGER,
+            message_hash TEXT NOT NULL,
+            archived_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS processed_deliveries (
+            delivery_key TEXT PRIMARY KEY,
+            expires_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_processed_deliveries_expires_at
+        ON processed_deliveries(expires_at)
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS slack_metadata (
+            kind TEXT NOT NULL,
+            object_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (kind, object_id)
+        )
+        """,
+    ]),
+    Migration(2, "request_lookup_indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_parent_id ON deletion_requests(parent_id)",
+        "CREATE INDEX IF NOT EXISTS idx_request_timestamp ON deletion_requests(request_timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_status ON deletion_requests(status)",
+        "CREATE INDEX IF NOT EXISTS idx_message_author ON deletion_requests(message_author_id)",
+        "CREATE INDEX IF NOT EXISTS idx_channel_request_timestamp ON deletion_requests(channel_id, request_timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_status_request_timestamp ON deletion_requests(status, request_timestamp)",
+    ], background=True),
+    Migration(3, "open_request_uniqueness", [
+        _close_duplicate_open_requests,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_open_message_request
+        ON deletion_requests(channel_id, message_ts)
+        WHERE request_type = 'message' AND status IN ('pending', 'processing')
+        """,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_open_thread_request
+        ON deletion_requests(channel_id, message_ts, requester_id)
+        WHERE request_type = 'thread_replies' AND status IN ('pending', 'processing')
+        """,
+    ], background=True),
+    Migration(4, "unredacted_request_index", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_unredacted_request_timestamp
+        ON deletion_requests(request_timestamp)
+        WHERE message_hash IS NULL
+        """,
+    ], background=True),
+    Migration(5, "deletion_request_files", [
+        """
+        CREATE TABLE IF NOT EXISTS deletion_request_files (
+            request_id INTEGER NOT NULL REFERENCES deletion_requests(id),
+            file_id TEXT NOT NULL,
+            file_name TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (request_id, file_id)
+        )
+        """,
+    ]),
+    Migration(6, "purge_jobs", [
+        """
+        CREATE TABLE IF NOT EXISTS purge_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_id INTEGER NOT NULL UNIQUE REFERENCES deletion_requests(id),
+            state TEXT NOT NULL DEFAULT 'running',
+            oldest TEXT,
+            latest TEXT,
+            cursor TEXT,
+            scanned INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_run_at TEXT NOT NULL,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_purge_jobs_due
+        ON purge_jobs(state, next_run_at)
+        """,
+    ]),
+    Migration(7, "admin_message_index", [
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_admin_message_ts
+        ON deletion_requests(admin_message_ts)
+        """,
+    ], background=True),
+]
\ No newline at end of file
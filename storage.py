@@ -0,0 +1,199 @@
+import itertools
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterable
+
+import config
+
+MIGRATION_LOCK_ID = 0x736c6163
+MIGRATION_LOCK_POLL_SECONDS = 0.5
+
+class SQLiteBackend:
+    name = "sqlite"
+    shared = False
+    lock_clause = ""
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=config.DATABASE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=config.DATABASE_STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={config.DATABASE_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={config.DATABASE_BUSY_TIMEOUT_MS}")
+        return conn
+
+    def ddl(self, statement: str) -> str:
+        return statement
+
+    def columns(self, conn, table: str) -> list[str]:
+        return [row["name"] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def stream(self, conn, query: str, params: Iterable[Any]):
+        return conn.execute(query, params)
+
+    def build_index(self, conn, statement: str):
+        conn.execute(statement)
+
+    @contextmanager
+    def migration_lock(self):
+        yield
+
+    def configure_new_database(self, conn):
+        self.enable_incremental_vacuum(conn)
+
+    def incremental_vacuum_enabled(self, conn) -> bool:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def enable_incremental_vacuum(self, conn) -> bool:
+        if self.incremental_vacuum_enabled(conn):
+            return False
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+    def compact(self, conn, max_pages: int):
+        conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+        conn.execute("PRAGMA optimize")
+
+@lru_cache(maxsize=512)
+def _to_pyformat(query: str) -> str:
+    return query.replace("%", "%%").replace("?", "%s")
+
+class PostgresConnection:
+    def __init__(self, conn, psycopg):
+        self._conn = conn
+        self._psycopg = psycopg
+        self._cursor_ids = itertools.count()
+
+    def execute(self, query: str, params: Iterable[Any] = ()):
+        return self._conn.execute(_to_pyformat(query), tuple(params))
+
+    def executemany(self, query: str, seq: Iterable[Iterable[Any]]):
+        cursor = self._conn.cursor()
+        cursor.executemany(_to_pyformat(query), [tuple(params) for params in seq])
+        return cursor
+
+    def execute_autocommit(self, query: str):
+        self._conn.autocommit = True
+        try:
+            self._conn.execute(_to_pyformat(query))
+        finally:
+            self._conn.autocommit = False
+
+    def server_cursor(self):
+        return self._conn.cursor(name=f"stream_{next(self._cursor_ids)}")
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        if self._conn.closed:
+            raise self._psycopg.OperationalError("connection is closed")
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+class PostgresBackend:
+    name = "postgresql"
+    shared = True
+    lock_clause = " FOR UPDATE SKIP LOCKED"
+
+    def __init__(self, url: str):
+        try:
+            import psycopg
+            from psycopg.rows import dict_row
+        except ImportError as e:
+            raise ValueError('DATABASE_URL points at PostgreSQL but psycopg is not installed (pip install "psycopg[binary]")') from e
+
+        self.url = url
+        self._psycopg = psycopg
+        self._dict_row = dict_row
+        self.Error = psycopg.Error
+        self.IntegrityError = psycopg.IntegrityError
+
+    def connect(self) -> PostgresConnection:
+        conn = self._psycopg.connect(
+            self.url,
+            row_factory=self._dict_row,
+            connect_timeout=max(1, config.DATABASE_BUSY_TIMEOUT_MS // 1000),
+            options=f"-c lock_timeout={config.DATABASE_BUSY_TIMEOUT_MS}"
+        )
+        return PostgresConnection(conn, self._psycopg)
+
+    def ddl(self, statement: str) -> str:
+        return statement.replace(
+            "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+        )
+
+    def columns(self, conn, table: str) -> list[str]:
+        rows = conn.execute("""
+            SELECT column_name AS name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ?
+        """, (table,)).fetchall()
+        return [row["name"] for row in rows]
+
+    def stream(self, conn: PostgresConnection, query: str, params: Iterable[Any]):
+        cursor = conn.server_cursor()
+        cursor.execute(_to_pyformat(query), tuple(params))
+        return cursor
+
+    def build_index(self, conn: PostgresConnection, statement: str):
+        statement = re.sub(r"CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", statement, count=1)
+        try:
+            conn.execute_autocommit(statement)
+        except self.Error:
+            match = re.search(r"IF NOT EXISTS (\w+)", statement)
+            if match:
+                conn.execute_autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {match.group(1)}")
+            raise
+
+    def configure_new_database(self, conn):
+        pass
+
+    def incremental_vacuum_enabled(self, conn) -> bool:
+        return True
+
+    def enable_incremental_vacuum(self, conn) -> bool:
+        return False
+
+    @contextmanager
+    def migration_lock(self):
+        conn = self.connect()
+        try:
+            # Poll instead of blocking so waiting sessions hold no snapshot that CREATE INDEX CONCURRENTLY would wait on
+            while True:
+                locked = conn.execute("SELECT pg_try_advisory_lock(?) AS locked", (MIGRATION_LOCK_ID,)).fetchone()["locked"]
+                conn.commit()
+                if locked:
+                    break
+                time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+            yield
+        finally:
+            conn.close()
+
+    def compact(self, conn, max_pages: int):
+        conn.execute("ANALYZE deletion_requests")
+        conn.execute("ANALYZE deletion_jobs")
+
+def create_backend(url: str, default_path: str):
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresBackend(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url:
+        raise ValueError("DATABASE_URL must start with postgresql:// or sqlite:///")
+    return SQLiteBackend(default_path)
\ No newline at end of file
@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+task_seconds = metrics.Histogram(
+    "slack_cleaner_task_seconds",
+    "Time spent running background handler tasks",
+    ["pool", "task"]
+)
+task_wait_seconds = metrics.Histogram(
+    "slack_cleaner_task_wait_seconds",
+    "Time background handler tasks spent queued before running",
+    ["pool", "task"]
+)
+
+class WorkerPool:
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name) if max_workers > 0 else None
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue) if max_workers > 0 else None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def submit(self, label: str, fn: Callable[..., Any], *args, **kwargs):
+        if not self.enabled or not self._slots.acquire(blocking=False):
+            if self.enabled:
+                with self._lock:
+                    self._rejected += 1
+                logger.warning(f"{self.name} queue full, running {label} inline")
+            self._run(label, time.monotonic(), fn, args, kwargs, queued=False)
+            return
+
+        with self._lock:
+            self._queued += 1
+        try:
+            self._executor.submit(self._run_slot, label, time.monotonic(), fn, args, kwargs)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+
+    def _run_slot(self, label, submitted_at, fn, args, kwargs):
+        try:
+            self._run(label, submitted_at, fn, args, kwargs, queued=True)
+        finally:
+            self._slots.release()
+
+    def _run(self, label, submitted_at, fn, args, kwargs, queued: bool):
+        started_at = time.monotonic()
+        with self._lock:
+            if queued:
+                self._queued -= 1
+            self._active += 1
+            depth = self._queued
+
+        failed = False
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            failed = True
+            logger.error(f"{self.name}: {label} failed: {e}")
+        finally:
+            elapsed = time.monotonic() - started_at
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._failed += int(failed)
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+
+        task_seconds.observe(elapsed, self.name, label)
+        task_wait_seconds.observe(started_at - submitted_at, self.name, label)
+        logger.info(
+            f"{self.name}: {label} took {elapsed * 1000:.0f}ms "
+            f"(waited {(started_at - submitted_at) * 1000:.0f}ms, queue depth {depth})"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_seconds": self._total_seconds / self._completed if self._completed else 0.0,
+                "max_seconds": self._max_seconds,
+            }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+
+FANOUT_PREFIX = "fanout"
+
+_fanout = ThreadPoolExecutor(max_workers=16, thread_name_prefix=FANOUT_PREFIX)
+
+def _call(call: Callable[[], Any]) -> Any:
+    try:
+        return call()
+    except Exception as e:
+        return e
+
+def gather(*calls: Callable[[], Any], executor: Optional[ThreadPoolExecutor] = None) -> List[Any]:
+    if executor is None and threading.current_thread().name.startswith(FANOUT_PREFIX):
+        # Waiting on _fanout from one of its own threads deadlocks once every worker does it
+        return [_call(call) for call in calls]
+
+    futures = [(executor or _fanout).submit(call) for call in calls]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
\ No newline at end of file